@@ -0,0 +1,107 @@
+"""
+Compare the JSON decoders available to nokey on large API payloads.
+
+Usage:
+    PYTHONPATH=. python benchmarks/json_decode.py [payload.json ...]
+
+Pass recorded response bodies (e.g. saved from APIsGuru.get_all_apis or
+RestCountries.get_all_countries) to time those. Without arguments, synthetic
+payloads shaped like the largest nokey responses are generated.
+"""
+import json
+import random
+import sys
+import time
+import requests
+from nokey.helperFuncs import json_backend
+
+
+def _spending_by_award(rng):
+    return {"limit": 5000, "results": [{
+        "internal_id": rng.randrange(10**8),
+        "Award ID": f"W{rng.randrange(10**10)}",
+        "Recipient Name": "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ ") for _ in range(30)),
+        "Award Amount": rng.random() * 10**7,
+        "Start Date": "2023-10-01", "End Date": "2024-09-30",
+        "Awarding Agency": "Department of Defense", "Awarding Sub Agency": "Department of the Army",
+        "Contract Award Type": "DEFINITIVE CONTRACT", "generated_internal_id": f"CONT_AWD_{rng.randrange(10**12)}",
+    } for _ in range(5000)]}
+
+
+def _all_apis(rng):
+    return {f"example{i}.com:api{i}": {"added": "2017-05-02T08:00:00.000Z", "preferred": "v1", "versions": {"v1": {
+        "added": "2017-05-02T08:00:00.000Z", "updated": "2023-03-06T07:12:59.965Z",
+        "info": {"title": f"API {i}", "description": "lorem ipsum " * rng.randrange(5, 60), "version": "v1",
+                 "x-apisguru-categories": ["developer_tools"], "x-logo": {"url": f"https://example{i}.com/logo.png"}},
+        "swaggerUrl": f"https://api.apis.guru/v2/specs/example{i}.com/v1/openapi.json", "openapiVer": "3.0.0",
+    }}} for i in range(2500)}
+
+
+def _county_time_series(rng):
+    dates = [f"{m}/{d}/23" for m in range(1, 13) for d in range(1, 29)]
+    return [{"country": "US", "county": f"county{i}", "province": "state", "timeline": {
+        "cases": {date: rng.randrange(10**5) for date in dates},
+        "deaths": {date: rng.randrange(10**3) for date in dates},
+    }} for i in range(300)]
+
+
+def _all_countries(rng):
+    return [{"name": {"common": f"Country {i}", "official": f"Republic of Country {i}", "nativeName": {"eng": {"official": "x", "common": "y"}}},
+             "cca2": "XX", "ccn3": str(i), "independent": True, "currencies": {"XXX": {"name": "Currency", "symbol": "$"}},
+             "capital": ["Capital"], "altSpellings": ["X", "Y"], "languages": {"eng": "English"},
+             "translations": {lang: {"official": "o" * 20, "common": "c" * 10} for lang in ("ara", "bre", "ces", "cym", "deu", "est", "fin", "fra", "hrv", "hun")},
+             "latlng": [rng.random() * 90, rng.random() * 180], "area": rng.random() * 10**6, "population": rng.randrange(10**9),
+             "borders": ["AAA", "BBB"], "timezones": ["UTC+01:00"]} for i in range(250)]
+
+
+def synthetic_payloads():
+    rng = random.Random(1234)
+    return {
+        "USAspending.get_spending_by_award": json.dumps(_spending_by_award(rng)).encode(),
+        "APIsGuru.get_all_apis": json.dumps(_all_apis(rng)).encode(),
+        "OpenDisease.get_nyt_time_series_covid_data_for_all_us_counties": json.dumps(_county_time_series(rng)).encode(),
+        "RestCountries.get_all_countries": json.dumps(_all_countries(rng)).encode(),
+    }
+
+
+def _as_response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    response.encoding = "utf-8"
+    response._content = body
+    return response
+
+
+def _best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(paths, repeat=5):
+    if paths:
+        payloads = {path: open(path, "rb").read() for path in paths}
+    else:
+        payloads = synthetic_payloads()
+    backends = json_backend.available_backends()
+    print(f"{'payload':<66} {'size':>9} {'response.json()':>16} " + " ".join(f"{name:>10}" for name in backends))
+    for name, body in payloads.items():
+        response = _as_response(body)
+        baseline = _best_of(response.json, repeat)
+        timings = []
+        for backend in backends:
+            json_backend.set_backend(backend)
+            timings.append(_best_of(lambda: json_backend.decode_response(response), repeat))
+        cells = " ".join(f"{t * 1000:8.1f}ms" for t in timings)
+        print(f"{name:<66} {len(body) / 1e6:7.2f}MB {baseline * 1000:14.1f}ms {cells}")
+        fastest = min(timings)
+        print(f"{'':<66} {'':>9} {'':>16} speedup of fastest backend: {baseline / fastest:.1f}x")
+    json_backend.set_backend(backends[0])
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
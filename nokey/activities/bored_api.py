@@ -1,7 +1,10 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import WEEK, NEVER_CACHE
+from .. helperFuncs.async_client import make_async_class
 
-class BoredAPI:
+class BoredAPI(BaseClient):
     """
     A class to interact with Bored API.
     
@@ -9,12 +12,14 @@ class BoredAPI:
         base_url: The base URL of the API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="bored_api_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_random_*": NEVER_CACHE, "get_activity_by_key": WEEK}
+    def __init__(self, use_caching=False, cache_name="bored_api_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "http://www.boredapi.com/api/"
         self.about = "The Bored API helps you find things to do when you're bored. There are fields like the number of participants, activity type, and more that help you narrow down your results."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -133,14 +138,6 @@ class BoredAPI:
         """
         endpoint = f"activity/?minaccessibility={minAccessibility}&maxaccessibility={maxAccessibility}"
         return mr.make_request(self.base_url+endpoint)
-     
-   
-  
-  
-        
-        
-    
-    
-    
-    
-        
\ No newline at end of file
+
+
+AsyncBoredAPI = make_async_class(BoredAPI)
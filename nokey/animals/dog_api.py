@@ -1,7 +1,10 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import DAY, WEEK, NEVER_CACHE
+from .. helperFuncs.async_client import make_async_class
 
-class DogAPI:
+class DogAPI(BaseClient):
     """
     A class to interact with the Dog API.
     
@@ -9,12 +12,14 @@ class DogAPI:
         base_url: The base URL for the API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="dog_api_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_random_*": NEVER_CACHE, "get_all_*": WEEK, "get_dog_images_by_breed": DAY}
+    def __init__(self, use_caching=False, cache_name="dog_api_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://dog.ceo/api/"
         self.about = "The Dog API returns URLs for dog images, either at random or by breed."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
         
     def get_docs_url(self):
         """
@@ -92,7 +97,6 @@ class DogAPI:
         """
         endpoint = f"breed/{breed.lower()}/images/random"
         return mr.make_request(self.base_url+endpoint)
-  
-   
-        
-    
\ No newline at end of file
+
+
+AsyncDogAPI = make_async_class(DogAPI)
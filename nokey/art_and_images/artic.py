@@ -1,9 +1,12 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import DAY, NEVER_CACHE
+from .. helperFuncs.async_client import make_async_class
 from .. helperFuncs.throttler import throttle_class
 
 @throttle_class(rate_limit=1, period=1)
-class Artic:
+class Artic(BaseClient):
     """
     A class for interacting with the Art Institute of Chicago API.
     
@@ -12,13 +15,15 @@ class Artic:
         image_api_url: The base URL for accessing the images in this API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="artic_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_*_by_id": DAY, "download_image": NEVER_CACHE}
+    def __init__(self, use_caching=False, cache_name="artic_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://api.artic.edu/api/v1/"
         self.image_api_url ="https://www.artic.edu/iiif/2/"
         self.about = "The Art Institute of Chicago's API provides JSON-formatted data as a REST-style service that allows developers to explore and integrate the museum’s public data into their projects. This API is the same tool that powers our website, our mobile app, and many other technologies in the museum."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -2345,77 +2350,22 @@ class Artic:
         return mr.make_request(self.base_url+endpoint)
         
     #Download Images
-    def download_image(self, image_id):
+    def download_image(self, image_id, progress=None):
         """
         Downloads a jpg of the image matching the id.
         
         Args:
             image_id (str): The unique identifier for the image. These can be obtained from both the images and exhibitions endpoints of the Artic API.
+            progress (callable, optional): Called as the image downloads with the bytes written so far and the total size, or None if unknown.
         
         Returns:
             image, str: Downloads an image and returns a string confirming the download.
         """
         endpoint = f"{image_id}/full/843,/0/default.jpg"
-        image_bin = mr.make_request_for_content(self.image_api_url+endpoint)
-        with open(image_id+".jpg", "wb") as f:
-            f.write(image_bin)
+        result = mr.make_request_for_content_to_file(self.image_api_url+endpoint, image_id+".jpg", progress=progress)
+        if isinstance(result, dict):
+            return result
         return f"Image with id {image_id} downloaded"
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-  
-    
-  
-    
-  
-    
-  
-    
-      
-  
-      
-  
-    
- 
-     
-  
-  
-  
-   
-   
-   
-        
-    
- 
-        
-   
-        
-    
\ No newline at end of file
+
+
+AsyncArtic = make_async_class(Artic)
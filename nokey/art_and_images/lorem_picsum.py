@@ -1,8 +1,10 @@
-import requests
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import DAY, WEEK
+from .. helperFuncs.async_client import make_async_class
 
-class LoremPicsum:
+class LoremPicsum(BaseClient):
     """
     A class for interacting with the Lorem Picsum API.
     
@@ -10,12 +12,14 @@ class LoremPicsum:
         base_url: The base URL of the API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="lorem_picsum_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"list_images": DAY, "get_image_info_by_*": WEEK}
+    def __init__(self, use_caching=False, cache_name="lorem_picsum_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://picsum.photos/"
         self.about = "This is an API for getting placeholder images, a Lorem Ipsum for images."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -172,7 +176,7 @@ class LoremPicsum:
             list: A list of images in the Lorem Picsum API.
         """
         endpoint = f"v2/list?page={page}&limit={limit}"
-        content = requests.get(self.base_url+endpoint)
+        content = mr.make_request_for_response(self.base_url+endpoint)
         return content.text
         
     def get_image_info_by_id(self, image_id):
@@ -200,8 +204,6 @@ class LoremPicsum:
         """
         endpoint = f"seed/{seed}/info"
         return mr.make_request(self.base_url+endpoint)
-   
-            
-        
-        
-        
\ No newline at end of file
+
+
+AsyncLoremPicsum = make_async_class(LoremPicsum)
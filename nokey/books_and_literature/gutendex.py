@@ -1,7 +1,10 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import DAY
+from .. helperFuncs.async_client import make_async_class
 
-class Gutendex:
+class Gutendex(BaseClient):
     """
     A class for interacting with the Gutendex API.
     
@@ -9,12 +12,14 @@ class Gutendex:
         base_url: The base URL for the API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="gutendex_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_book_by_id": DAY, "get_books_by_ids": DAY, "get_authors_*": DAY}
+    def __init__(self, use_caching=False, cache_name="gutendex_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://gutendex.com/books/"
         self.about = "Gutendex is a JSON web API for Project Gutenberg ebook metadata."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -130,4 +135,7 @@ class Gutendex:
             dict: Returns a dictionary containing metadata for books by authors who were alive before the specified year.
         """
         endpoint = f"?author_year_end={author_year_end}&sort={sort}&languages={language}"
-        return mr.make_request(self.base_url+endpoint)
\ No newline at end of file
+        return mr.make_request(self.base_url+endpoint)
+
+
+AsyncGutendex = make_async_class(Gutendex)
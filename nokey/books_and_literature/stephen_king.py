@@ -1,7 +1,10 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import WEEK
+from .. helperFuncs.async_client import make_async_class
 
-class StephenKingAPI:
+class StephenKingAPI(BaseClient):
     """
     A class to interact with the Stephen King API.
     
@@ -9,12 +12,14 @@ class StephenKingAPI:
         base_url: The base URL of the API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="stephen_king_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_stephen_king_*": WEEK}
+    def __init__(self, use_caching=False, cache_name="stephen_king_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://stephen-king-api.onrender.com/api/"
         self.about = "The Stephen King API is for accessing the varied worked and villains of Stephen King's books and stories. (Note: This API is not entirely up to date.)"
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -105,10 +110,6 @@ class StephenKingAPI:
         """
         endpoint = f"villain/{villain_id}"
         return mr.make_request(self.base_url+endpoint)
-   
-   
-  
-   
- 
-        
-        
\ No newline at end of file
+
+
+AsyncStephenKingAPI = make_async_class(StephenKingAPI)
@@ -1,8 +1,10 @@
-import requests
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import DAY, WEEK
+from .. helperFuncs.async_client import make_async_class
 
-class NagerDate:
+class NagerDate(BaseClient):
     """
     A class to interact with the Nager.Date API.
     
@@ -10,12 +12,14 @@ class NagerDate:
         base_url: The base URL of the API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="nager_date_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_available_countries": WEEK, "get_country_info": WEEK, "get_public_holidays": DAY, "get_long_weekends_by_country": DAY}
+    def __init__(self, use_caching=False, cache_name="nager_date_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://date.nager.at/api/v3/"
         self.about = "The Nager.Date API provides a simple way to query the holidays of over 100 countries. It is also possible to query long weekends."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -96,7 +100,7 @@ class NagerDate:
         """
         endpoint = f"IsTodayPublicHoliday/{countryCode}?offset={utc_offset}"
         url = self.base_url+endpoint
-        response = requests.get(url)
+        response = mr.make_request_for_response(url)
         if response.status_code == 200:
             return True
         elif response.status_code == 204:
@@ -131,14 +135,6 @@ class NagerDate:
         """
         endpoint = "NextPublicHolidaysWorldwide"
         return mr.make_request(self.base_url+endpoint)
-     
-  
-            
-    
-           
-        
-    
-        
-        
-        
-        
\ No newline at end of file
+
+
+AsyncNagerDate = make_async_class(NagerDate)
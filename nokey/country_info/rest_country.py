@@ -1,8 +1,11 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import DAY
+from .. helperFuncs.async_client import make_async_class
 
 
-class RestCountries:
+class RestCountries(BaseClient):
     """
     A class to interact with the RestCountries API.
     
@@ -10,12 +13,14 @@ class RestCountries:
         base_url: The base URL of the RestCountries API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="rest_country_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_*": DAY}
+    def __init__(self, use_caching=False, cache_name="rest_country_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://restcountries.com/v3.1/"
         self.about = "REST Countries API is a simple REST API from RapidAPI that provides information about countries in the world In JSON format."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -145,5 +150,6 @@ class RestCountries:
         """
         endpoint = "all"
         return mr.make_request(self.base_url+endpoint)
-    
 
+
+AsyncRestCountries = make_async_class(RestCountries)
@@ -1,7 +1,10 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import HOUR, DAY
+from .. helperFuncs.async_client import make_async_class
 
-class APIsGuru:
+class APIsGuru(BaseClient):
     """
     A class to interact with the APIs.guru API.
     
@@ -9,12 +12,14 @@ class APIsGuru:
         base_url: The base url for the APIs.guru API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="api_gurus_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_basic_metrics": HOUR, "get_all_apis": HOUR, "get_*": DAY}
+    def __init__(self, use_caching=False, cache_name="api_gurus_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://api.apis.guru/v2/"
         self.about = "The APIs.guru API is a self-proclaimed Wikipedia for APIs, maintaining an Open API directory."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -121,12 +126,6 @@ class APIsGuru:
         """
         endpoint = "metrics.json"
         return mr.make_request(self.base_url+endpoint)
-  
-  
-        
-        
-    
-      
-      
-      
-        
\ No newline at end of file
+
+
+AsyncAPIsGuru = make_async_class(APIsGuru)
@@ -1,7 +1,10 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import DAY, WEEK
+from .. helperFuncs.async_client import make_async_class
 
-class FilterLists:
+class FilterLists(BaseClient):
     """
     A class for interacting with the FilterLists API.
     
@@ -9,12 +12,14 @@ class FilterLists:
         base_url: The base URL of the FilterLists API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="filter_lists_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_lists": DAY, "get_list_by_id": DAY, "get_*": WEEK}
+    def __init__(self, use_caching=False, cache_name="filter_lists_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "http://filterlists.com/api/directory/"
         self.about = "The FilterLists Directory API provides lists of filters used by AD blockers."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -131,11 +136,6 @@ class FilterLists:
         """
         endpoint = "tags"
         return mr.make_request(self.base_url+endpoint)
-       
-       
-       
-       
-    
-    
-    
-    
\ No newline at end of file
+
+
+AsyncFilterLists = make_async_class(FilterLists)
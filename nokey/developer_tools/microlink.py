@@ -1,7 +1,9 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.async_client import make_async_class
 
-class Microlink:
+class Microlink(BaseClient):
     """
     A class for interacting with the Microlink API.
     
@@ -10,12 +12,13 @@ class Microlink:
         about: A short description of the API.
     """
     
-    def __init__(self, use_caching=False, cache_name="microlink_cache", backend="sqlite", expire_after=3600):
+    def __init__(self, use_caching=False, cache_name="microlink_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://api.microlink.io"
         self.about = "Microlink API provides a powerful API for automating any browser action. Free use is limited to 50 requests a day."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -83,8 +86,6 @@ class Microlink:
         params = {'url': url, "palette": True}
         metadata = mr.make_request_with_params(self.base_url, params)
         return metadata
-        
-        
 
-        
-        
\ No newline at end of file
+
+AsyncMicrolink = make_async_class(Microlink)
@@ -1,10 +1,13 @@
 import os
-import requests
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.json_backend import decode_response
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import MINUTE, NEVER_CACHE
+from .. helperFuncs.async_client import make_async_class
 
 
-class URLHaus:
+class URLHaus(BaseClient):
     """
     A class to interact with the URLHaus API.
     
@@ -12,12 +15,15 @@ class URLHaus:
         base_url: The base URL of the API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="urlhaus_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_recent_urls": MINUTE, "get_recent_payloads": MINUTE, "get_info_about_*": 5 * MINUTE, "download_malware_sample": NEVER_CACHE}
+    def __init__(self, use_caching=False, cache_name="urlhaus_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://urlhaus-api.abuse.ch/v1/"
         self.about = "URLhaus is a project operated by abuse.ch. The purpose of the project is to collect, track and share malware URLs, helping network administrators and security analysts to protect their network and customers from cyber threats."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            # The get_info_about_* lookups are POST requests, which requests_cache only caches if told to.
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after, allowable_methods=("GET", "HEAD", "POST"))
             
     def get_docs_url(self):
         """
@@ -75,9 +81,9 @@ class URLHaus:
         """
         payload = {"url": f"{url}"}
         endpoint = "url/"
-        response = requests.post(self.base_url+endpoint, payload)
+        response = mr.make_request_for_response(self.base_url+endpoint, method="POST", data=payload)
         if response.status_code == 200:
-            return response.json()
+            return decode_response(response)
         else:
             return f"Error: {response.status_code}"
             
@@ -93,9 +99,9 @@ class URLHaus:
         """
         payload = {"urlid": f"{urlID}"}
         endpoint = "urlid/"
-        response = requests.post(self.base_url+endpoint, payload)
+        response = mr.make_request_for_response(self.base_url+endpoint, method="POST", data=payload)
         if response.status_code == 200:
-            return response.json()
+            return decode_response(response)
         else:
             return f"Error: {response.status_code}"
             
@@ -111,9 +117,9 @@ class URLHaus:
         """
         payload = {"host": f"{host}"}
         endpoint = "host/"
-        response = requests.post(self.base_url+endpoint, payload)
+        response = mr.make_request_for_response(self.base_url+endpoint, method="POST", data=payload)
         if response.status_code == 200:
-            return response.json()
+            return decode_response(response)
         else:
             return f"Error: {response.status_code}"
             
@@ -129,9 +135,9 @@ class URLHaus:
         """
         payload = {"payload": f"{p_load}"}
         endpoint = "payload/"
-        response = requests.post(self.base_url+endpoint, payload)
+        response = mr.make_request_for_response(self.base_url+endpoint, method="POST", data=payload)
         if response.status_code == 200:
-            return response.json()
+            return decode_response(response)
         else:
             return f"Error: {response.status_code}"
             
@@ -147,9 +153,9 @@ class URLHaus:
         """
         payload = {"tag": f"{tag}"}
         endpoint = "tag/"
-        response = requests.post(self.base_url+endpoint, payload)
+        response = mr.make_request_for_response(self.base_url+endpoint, method="POST", data=payload)
         if response.status_code == 200:
-            return response.json()
+            return decode_response(response)
         else:
             return f"Error: {response.status_code}"
             
@@ -165,19 +171,20 @@ class URLHaus:
         """
         payload = {"signature": f"{signature}"}
         endpoint = "signature/"
-        response = requests.post(self.base_url+endpoint, payload)
+        response = mr.make_request_for_response(self.base_url+endpoint, method="POST", data=payload)
         if response.status_code == 200:
-            return response.json()
+            return decode_response(response)
         else:
             return f"Error: {response.status_code}"
             
-    def download_malware_sample(self, sha256):
+    def download_malware_sample(self, sha256, progress=None):
         """
         Downloads a zip file containing the malware sample (payload).
     
         Args:
             base_url (str): The base URL of the API.
             sha256 (str): The SHA256 hash identifying the malware sample (payload) to be downloaded.
+            progress (callable, optional): Called as the file downloads with the bytes written so far and the total size, or None if unknown.
     
         Returns:
             - str: Path to the downloaded ZIP file if successful, error message otherwise.
@@ -186,8 +193,8 @@ class URLHaus:
         endpoint = f"download/{sha256}"
         url = self.base_url + endpoint
 
-        # Send the GET request
-        response = requests.get(url)
+        # Send the GET request, leaving the body to be streamed to disk
+        response = mr.make_request_for_response(url, stream=True)
 
         # Check if the request was successful (status code 200)
         if response.status_code == 200:
@@ -199,21 +206,17 @@ class URLHaus:
                 current_directory = os.getcwd()
                 # Define the path to save the ZIP file
                 zip_path = os.path.join(current_directory, filename)
-                # Save the content to the ZIP file
-                with open(zip_path, 'wb') as f:
-                    f.write(response.content)
+                # Stream the content to the ZIP file
+                mr.write_response_content(response, zip_path, progress=progress)
                 return zip_path
             else:
+                response.close()
                 return "Error: Response does not contain a ZIP file."
-        elif response.status_code == 404:
+        response.close()
+        if response.status_code == 404:
             return "Error: Malware sample not found."
         else:
-            return f"Error: {response.status_code}"      
-     
-     
-     
-     
-       
-        
-    
-    
\ No newline at end of file
+            return f"Error: {response.status_code}"
+
+
+AsyncURLHaus = make_async_class(URLHaus)
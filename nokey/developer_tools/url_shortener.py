@@ -1,9 +1,11 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.async_client import make_async_class
 from .. helperFuncs.throttler import throttle_class
 
-@throttle_class(rate_limit=200, period=3600)
-class UrlShortener:
+@throttle_class(rate_limit=200, period=3600, burst=20)
+class UrlShortener(BaseClient):
     """
     A class for interacting with the URL Shortener API.
     
@@ -11,12 +13,13 @@ class UrlShortener:
         base_url: The base URL of the URL Shortener API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="url_shortener_cache", backend="sqlite", expire_after=3600):
+    def __init__(self, use_caching=False, cache_name="url_shortener_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://is.gd/create.php?"
         self.about = "This URL Shortener API (from is.gd) is a URL shortener service."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -50,5 +53,6 @@ class UrlShortener:
         else:
             endpoint = f"format=json&url={url}"
             return mr.make_request(self.base_url+endpoint)
-                    
-                    
\ No newline at end of file
+
+
+AsyncUrlShortener = make_async_class(UrlShortener)
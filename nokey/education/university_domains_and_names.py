@@ -1,7 +1,10 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import DAY, NEVER_CACHE
+from .. helperFuncs.async_client import make_async_class
 
-class UniversityDomainsAndNames:
+class UniversityDomainsAndNames(BaseClient):
     """
     A class to interact with the University Domains and Names API.
     
@@ -9,13 +12,15 @@ class UniversityDomainsAndNames:
         base_url: The base url for the University Domains and Names API.
         about: A short description of the API.
     """
+    cache_ttl = {"update_list": NEVER_CACHE, "get_university_name_and_domain": DAY}
     
-    def __init__(self, use_caching=False, cache_name="university_cache", backend="sqlite", expire_after=3600):
+    def __init__(self, use_caching=False, cache_name="university_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "http://universities.hipolabs.com/search?"
         self.about = "This API accesses a list of universities and their domain names."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -64,8 +69,6 @@ class UniversityDomainsAndNames:
         """
         endpoint = "update"
         return mr.make_request(self.base_url+endpoint)
-        
-        
-        
-      
-        
\ No newline at end of file
+
+
+AsyncUniversityDomainsAndNames = make_async_class(UniversityDomainsAndNames)
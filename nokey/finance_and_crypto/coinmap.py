@@ -1,9 +1,12 @@
 from datetime import date
 from typing import Optional
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import DAY
+from .. helperFuncs.async_client import make_async_class
 
-class Coinmap:
+class Coinmap(BaseClient):
     """
     A class for interacting with the Coinmap API.
     
@@ -11,12 +14,14 @@ class Coinmap:
         base_url: The base URL of the Coinmap API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="coinmap_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_coins": DAY, "get_atm_operators": DAY, "get_venue_by_id": DAY}
+    def __init__(self, use_caching=False, cache_name="coinmap_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://coinmap.org/api/v1/"
         self.about = "The CoinMap API is a free resource to access data about thousands of crypto merchants, ATMs, grocery stores, shops, cafes, and other venues. This API is really simple to use since it has a flat data structure, doesn't require authorization, and a well-described data format."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -174,9 +179,6 @@ class Coinmap:
 #        """
 #        endpoint = "providers"
 #        return mr.make_request(self.base_url+endpoint)
-        
-    
-    
-        
-        
-        
\ No newline at end of file
+
+
+AsyncCoinmap = make_async_class(Coinmap)
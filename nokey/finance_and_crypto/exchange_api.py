@@ -1,7 +1,10 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import HOUR, DAY
+from .. helperFuncs.async_client import make_async_class
 
-class ExchangeAPI:
+class ExchangeAPI(BaseClient):
     """
     A class for interacting with Exchange API.
     
@@ -9,12 +12,14 @@ class ExchangeAPI:
         base_url: The base URL of the API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="exchange_api_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_available_currencies": DAY, "get_rates_from_base": HOUR}
+    def __init__(self, use_caching=False, cache_name="exchange_api_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@"
         self.about = "ExchangeAPI is a free currency exchange rates API with 150+ currencies and no rate limits."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -65,10 +70,6 @@ class ExchangeAPI:
         else:
             endpoint = f"{date}/v1/currencies/{currency_code.lower()}.json"
             return mr.make_request(self.base_url+endpoint)
-            
-    
-            
-    
-        
-        
-        
\ No newline at end of file
+
+
+AsyncExchangeAPI = make_async_class(ExchangeAPI)
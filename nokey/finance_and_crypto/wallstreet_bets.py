@@ -1,8 +1,11 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import MINUTE
+from .. helperFuncs.async_client import make_async_class
 
 
-class WallstreetBets:
+class WallstreetBets(BaseClient):
     """
     A class to interact with the Wallstreet Bets API.
     
@@ -10,12 +13,14 @@ class WallstreetBets:
         base_url: The base URL of the Wallstreet Bets API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="wallstree_bets_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_stock_sentiment_from_reddit": 15 * MINUTE}
+    def __init__(self, use_caching=False, cache_name="wallstree_bets_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://tradestie.com/api/v1/apps/reddit"
         self.about = "This API gets the top 50 stocks discussed on the Reddit subreddit, Wallstreetbets"
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -40,4 +45,6 @@ class WallstreetBets:
             list: List of dictionaries containing information about subreddit comments of top 50 stocks.
         """
         return mr.make_request(self.base_url)
-    
\ No newline at end of file
+
+
+AsyncWallstreetBets = make_async_class(WallstreetBets)
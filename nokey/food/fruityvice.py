@@ -1,7 +1,10 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import DAY
+from .. helperFuncs.async_client import make_async_class
 
-class Fruityvice:
+class Fruityvice(BaseClient):
     """
     A class to interact with the Fruityvice API.
     
@@ -9,13 +12,15 @@ class Fruityvice:
         base_url: The base url of the Fruityvice API.
         about: A short description of the API.
     """
+    cache_ttl = {"get_*": DAY}
     
-    def __init__(self, use_caching=False, cache_name="fruityvice_cache", backend="sqlite", expire_after=3600):
+    def __init__(self, use_caching=False, cache_name="fruityvice_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://www.fruityvice.com/api/fruit/"
         self.about = "Fruityvice is an API that provides information on fruits and their nutritional value."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -95,7 +100,6 @@ class Fruityvice:
         """
         endpoint = f"order/{order}"
         return mr.make_request(self.base_url+endpoint)
-     
-     
-        
-    
+
+
+AsyncFruityvice = make_async_class(Fruityvice)
@@ -1,7 +1,10 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import DAY
+from .. helperFuncs.async_client import make_async_class
 
-class FreeToGame:
+class FreeToGame(BaseClient):
     """
     Class to interact with the Free To Game API.
     
@@ -9,12 +12,14 @@ class FreeToGame:
         base_url: The base URL of the Free To Game API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="freetogame_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_game_by_id": DAY}
+    def __init__(self, use_caching=False, cache_name="freetogame_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://www.freetogame.com/api/"
         self.about = "The Free To Game API is a way to access programmatically the best free-to-play games and free MMO games."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -126,9 +131,6 @@ class FreeToGame:
         """
         endpoint = f"game?id={gameID}"
         return mr.make_request(self.base_url+endpoint)
-     
-     
-       
-       
-        
-        
\ No newline at end of file
+
+
+AsyncFreeToGame = make_async_class(FreeToGame)
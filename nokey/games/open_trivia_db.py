@@ -1,7 +1,10 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import NEVER_CACHE
+from .. helperFuncs.async_client import make_async_class
 
-class OpenTriviaDB:
+class OpenTriviaDB(BaseClient):
     """
     A class for interacting with the Open Trivia Database API.
     
@@ -9,12 +12,14 @@ class OpenTriviaDB:
         base_url: The base URL of the API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="open_trivia_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_random_trivia_questions": NEVER_CACHE, "get_specified_trivia_questions": NEVER_CACHE}
+    def __init__(self, use_caching=False, cache_name="open_trivia_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://opentdb.com/api.php?"
         self.about = "The Open Trivia Database provides a completely free JSON API to retrieve trivia questions for use in programming projects."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -108,5 +113,7 @@ class OpenTriviaDB:
             
         # returns random questions of a given amount (same as get_random_trivia_questions).
         else:
-            return self.get_random_trivia_questions(amount=amount)       
-                       
\ No newline at end of file
+            return self.get_random_trivia_questions(amount=amount)
+
+
+AsyncOpenTriviaDB = make_async_class(OpenTriviaDB)
@@ -1,7 +1,10 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import WEEK, NEVER_CACHE
+from .. helperFuncs.async_client import make_async_class
 
-class Shadify:
+class Shadify(BaseClient):
     """
     A class for interacting with the Shadify API.
     
@@ -9,12 +12,14 @@ class Shadify:
         base_url: The base URL of the API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="shadify_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"generate_*": NEVER_CACHE, "get_all_set_cards": WEEK}
+    def __init__(self, use_caching=False, cache_name="shadify_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://shadify.dev/api/"
         self.about = "Shadify is a powerful REST API service provides a collection of different puzzle types, like crosswords, Sudoku, word search and so on. The API allows users to generate data for puzzles, check the correctness of solutions, and configure various parameters to change the difficulty of the puzzles."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -587,18 +592,6 @@ class Shadify:
             exit()
         endpoint = f"memory/generator?width={width}&height={height}&pair-size={pair_size}&show-positions={show_positions}"
         return mr.make_request(self.base_url+endpoint)
-        
-        
-            
-    
-    
-    
-        
-    
-        
-  
-   
-        
-    
-    
-        
\ No newline at end of file
+
+
+AsyncShadify = make_async_class(Shadify)
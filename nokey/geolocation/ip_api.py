@@ -1,9 +1,12 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import DAY
+from .. helperFuncs.async_client import make_async_class
 from .. helperFuncs.throttler import throttle_class
 
-@throttle_class(rate_limit=45, period=60)
-class IP_API:
+@throttle_class(rate_limit=45, period=60, burst=5)
+class IP_API(BaseClient):
     """
     A class to interact with the IP API.
     
@@ -11,12 +14,14 @@ class IP_API:
         base_url: The base URL of IP API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="ip_api_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_location_info_by_ip_address": DAY}
+    def __init__(self, use_caching=False, cache_name="ip_api_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "http://ip-api.com/json/" 
         self.about = "The IP API is a fast, reliable, and free IP geolocation API."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -42,4 +47,6 @@ class IP_API:
         """
         endpoint = f"{ip}"
         return mr.make_request(self.base_url+endpoint)
-    
\ No newline at end of file
+
+
+AsyncIP_API = make_async_class(IP_API)
@@ -1,7 +1,10 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import DAY, WEEK
+from .. helperFuncs.async_client import make_async_class
 
-class Zippopotomus:
+class Zippopotomus(BaseClient):
     """
     A class to interact with the Zippopotomus API.
     
@@ -9,12 +12,15 @@ class Zippopotomus:
         base_url: The basee URL of the API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="zippopotomus_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_*": WEEK}
+    negative_ttl = DAY
+    def __init__(self, use_caching=False, cache_name="zippopotomus_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "http://api.zippopotam.us/"
         self.about = "Zippopotamus is an open source project that is focused on converting zip codes into valid geographical locations."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -55,4 +61,7 @@ class Zippopotomus:
             dict: A dictionary containing the zipcode of the given location.
         """
         endpoint = f"{country}/{state}/{city}"
-        return mr.make_request(self.base_url+endpoint)
\ No newline at end of file
+        return mr.make_request(self.base_url+endpoint)
+
+
+AsyncZippopotomus = make_async_class(Zippopotomus)
@@ -1,7 +1,10 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import MINUTE, DAY
+from .. helperFuncs.async_client import make_async_class
 
-class FederalRegister:
+class FederalRegister(BaseClient):
     """
     A class for interacting with the Federal Register API.
     
@@ -9,12 +12,20 @@ class FederalRegister:
         base_url: The base URL of the API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="federal_register_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {
+        "get_current_public_inspection_documents": 5 * MINUTE,
+        "get_fed_reg_document": DAY,
+        "get_multiple_fed_reg_documents": DAY,
+        "get_agencies_details": DAY,
+        "get_agency_by_slug": DAY,
+    }
+    def __init__(self, use_caching=False, cache_name="federal_register_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://www.federalregister.gov/api/v1/"
         self.about = "FederalRegister.gov provides multiple public API endpoints. These can be used to access information in the Federal Register, the daily journal of the US government."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -238,17 +249,6 @@ class FederalRegister:
         """
         endpoint = f"suggested_searches/{slug}"
         return mr.make_request(self.base_url+endpoint)
- 
-  
-   
-   
-        
-        
- 
- 
- 
- 
-        
-    
- 
-       
\ No newline at end of file
+
+
+AsyncFederalRegister = make_async_class(FederalRegister)
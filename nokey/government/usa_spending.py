@@ -1,10 +1,14 @@
-import requests_cache
+import os
 import datetime as dt
-from .. helperFuncs import make_request as mr 
+from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import DAY, WEEK, NEVER_CACHE
+from .. helperFuncs.async_client import make_async_class
 
 current = dt.datetime.now().year
 
-class USAspending:
+class USAspending(BaseClient):
     """
     A class for interacting with the USA Spending API.
     
@@ -12,12 +16,28 @@ class USAspending:
         base_url: The base URL for the API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="usa_spending_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {
+        "get_download_status": NEVER_CACHE,
+        "download_file": NEVER_CACHE,
+        "get_budget_functions": WEEK,
+        "get_budget_subfunctions": WEEK,
+        "get_def_codes": WEEK,
+        "get_glossary": WEEK,
+        "get_data_dictionary": WEEK,
+        "get_award_types": WEEK,
+        "get_naics_codes": WEEK,
+        "get_states": WEEK,
+        "get_toptier_agencies": DAY,
+        "list_agencies": DAY,
+        "get_submission_periods": DAY,
+    }
+    def __init__(self, use_caching=False, cache_name="usa_spending_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://api.usaspending.gov/api/v2/"
         self.about = "USAspending is the official open data source of federal spending information, including information about federal awards such as contracts, grants, and loans."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -866,6 +886,25 @@ class USAspending:
         enpoint = f"bulk_download/status?file_name={file_name}"
         return mr.make_request(self.base_url+enpoint)
         
+    def download_file(self, file_url, destination=None, progress=None):
+        """
+        Downloads a file generated by one of the download endpoints, streaming it to disk so large files are never held in memory.
+        
+        Args:
+            file_url (str): The URL of the file. Taken from the file_url field of a download endpoint response.
+            destination (str or file-like): Where to save the file. Defaults to the file's name in the current directory.
+            progress (callable, optional): Called as the file downloads with the bytes written so far and the total size, or None if unknown.
+        
+        Returns:
+            str: The path the file was saved to, or a dictionary containing an error message.
+        """
+        if destination is None:
+            destination = os.path.join(os.getcwd(), file_url.rstrip("/").split("/")[-1])
+        result = mr.make_request_for_content_to_file(file_url, destination, progress=progress)
+        if isinstance(result, dict):
+            return result
+        return destination
+        
     ### Emergency and disaster related functions
     def get_count_agencies_receiving_def(self, def_codes):
         """
@@ -2700,176 +2739,6 @@ class USAspending:
                 } 
         endpoint = "transactions/"
         return mr.make_request_with_post_and_json(self.base_url+endpoint, json=data)
-  
-  
-  
-  
-   
-  
-  
-  
-   
-  
-   
-   
-   
-   
-   
-   
-   
-   
-   
-   
-   
- 
-   
-   
-  
-   
-   
-   
-   
-  
-   
-  
-   
-    
-   
-    
- 
-        
-    
-        
-    
-   
- 
-  
- 
-  
-  
-        
 
-    
- 
-   
- 
-   
-    
-  
-   
-    
-        
- 
- 
- 
- 
- 
- 
-        
- 
-    
-    
-  
-  
-  
-  
-  
-  
-   
-   
-   
-   
-        
-  
-        
-    
-        
-              
-        
-  
-  
-        
-    
- 
-        
-            
-       
-    
- 
-   
-     
-   
-    
-    
-   
-   
-   
-    
-     
-       
-        
-        
-  
-  
-  
-  
-  
-  
-  
-  
-  
-    
-   
-   
-   
-   
-  
-   
-   
-     
-    
-     
-     
-   
-  
-  
-  
-  
-  
-  
-  
-  
-   
- 
-   
-        
-        
-        
-                    
-                    
-    
-  
-  
-    
-      
-  
-  
- 
- 
- 
-  
-  
-   
-   
-   
-   
-        
-    
-        
-    
-  
-       
-       
-       
-        
-        
\ No newline at end of file
+
+AsyncUSAspending = make_async_class(USAspending)
@@ -1,7 +1,9 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.async_client import make_async_class
 
-class OpenDisease:
+class OpenDisease(BaseClient):
     """
     A class for interacting with the Open Disease API.
     
@@ -9,12 +11,13 @@ class OpenDisease:
         base_url: The base URL for the API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="open_disease_cache", backend="sqlite", expire_after=3600):
+    def __init__(self, use_caching=False, cache_name="open_disease_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://disease.sh/v3/"
         self.about = "Open Disease is a Third Party API for reliable global disease information, serving COVID and influenza data (Note: None of the data in this API seems to be up to date)"
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -647,41 +650,6 @@ class OpenDisease:
         """
         endpoint = f"covid-19/variants/countries/{country}"
         return mr.make_request(self.base_url+endpoint)
-   
-   
-  
-   
-   
-    
-    
-    
- 
-  
-    
- 
- 
- 
-    
-   
-  
- 
-  
-  
-    
-  
- 
- 
-  
-    
-  
-        
-     
-        
-    
-       
-  
-    
-      
-  
-   
-        
\ No newline at end of file
+
+
+AsyncOpenDisease = make_async_class(OpenDisease)
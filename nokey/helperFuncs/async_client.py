@@ -0,0 +1,109 @@
+import inspect
+from . async_make_request import run_sync
+from . batch import amap_calls, DEFAULT_CONCURRENCY
+
+
+class AsyncClient:
+    """
+    Base class for the asynchronous versions of the API classes.
+
+    An asynchronous class holds an instance of its synchronous class and exposes the same methods as
+    coroutines. Requests are sent through the aiohttp session shared on the running event loop, and
+    the synchronous class's rate limit still applies: requests await their turn, sharing the budget with
+    synchronous callers, without blocking the event loop.
+
+    Asynchronous clients do not cache responses, so they reject use_caching=True and a requests session.
+
+    Attributes:
+        client: The synchronous API class instance doing the work.
+        async_session (aiohttp.ClientSession): The session used for this client's requests. None means the shared session of the running loop.
+    """
+    client_class = None
+
+    def __init__(self, *args, async_session=None, **kwargs):
+        arguments = inspect.signature(self.client_class).bind_partial(*args, **kwargs).arguments
+        if arguments.get("use_caching") or arguments.get("session") is not None:
+            raise ValueError(f"{type(self).__name__} sends its requests with aiohttp and does not cache them. "
+                             f"Use {self.client_class.__name__} for use_caching or a requests session, or pass async_session.")
+        self.client = self.client_class(*args, **kwargs)
+        self.async_session = async_session
+
+    def __getattr__(self, name):
+        # Only reached for names the asynchronous class does not define, such as base_url and about.
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def __setattr__(self, name, value):
+        # Settings such as timeout, retry and raise_errors are read by the synchronous client, so they are set on it.
+        if name in ("client", "async_session"):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.client, name, value)
+
+    async def _call(self, name, *args, **kwargs):
+        func = getattr(type(self.client), name)
+        return await run_sync(func, self.client, *args, session=self.async_session, **kwargs)
+
+    def map(self, method, iterable, concurrency=DEFAULT_CONCURRENCY, ordered=True):
+        """
+        Await one of this client's methods once per item, with at most concurrency calls in flight.
+
+        Args:
+            method (str or callable): The name of a method of this client, or a coroutine function taking one item.
+            iterable: The items to call the method with.
+            concurrency (int): The maximum number of calls in flight. Default is 8.
+            ordered (bool): If True, results are yielded in input order. If False, they are yielded as they complete.
+
+        Returns:
+            async generator: BatchResult tuples (index, item, result, error), one per item.
+        """
+        func = getattr(self, method) if isinstance(method, str) else method
+        return amap_calls(func, iterable, concurrency=concurrency, ordered=ordered)
+
+    def starmap(self, method, iterable, concurrency=DEFAULT_CONCURRENCY, ordered=True):
+        """
+        Like map, but each item is a tuple of arguments.
+
+        Args:
+            method (str or callable): The name of a method of this client, or a coroutine function.
+            iterable: Tuples of arguments to call the method with.
+            concurrency (int): The maximum number of calls in flight. Default is 8.
+            ordered (bool): If True, results are yielded in input order. If False, they are yielded as they complete.
+
+        Returns:
+            async generator: BatchResult tuples (index, item, result, error), one per item.
+        """
+        func = getattr(self, method) if isinstance(method, str) else method
+        return amap_calls(lambda args: func(*args), iterable, concurrency=concurrency, ordered=ordered)
+
+
+def _async_method(name, func):
+    async def method(self, *args, **kwargs):
+        return await self._call(name, *args, **kwargs)
+    method.__name__ = name
+    method.__qualname__ = func.__qualname__
+    method.__doc__ = func.__doc__
+    return method
+
+
+def make_async_class(cls):
+    """
+    Build the asynchronous version of an API class.
+
+    Args:
+        cls: The synchronous API class.
+
+    Returns:
+        cls: A subclass of AsyncClient named "Async" plus the name of the given class, with each public method of it as a coroutine.
+    """
+    namespace = {
+        "client_class": cls,
+        "__doc__": f"Asynchronous version of {cls.__name__}. Every method is a coroutine with the same arguments.",
+        "__module__": cls.__module__,
+    }
+    for attr_name in dir(cls):
+        attr = getattr(cls, attr_name)
+        if not attr_name.startswith("_") and callable(attr) and not hasattr(AsyncClient, attr_name):
+            namespace[attr_name] = _async_method(attr_name, attr)
+    return type(f"Async{cls.__name__}", (AsyncClient,), namespace)
@@ -0,0 +1,416 @@
+import asyncio
+import datetime
+import os
+import time
+import weakref
+import requests
+from requests.exceptions import Timeout, ConnectionError as RequestsConnectionError
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from . import make_request as mr
+from . base_client import _current_replay
+from . retry import DEFAULT_TIMEOUT, DEFAULT_RETRY, RequestInfo
+from . session import _default_options
+from . single_flight import async_single_flight, request_key
+from . conditional import validator_store, remember
+from . compression import Decoder, accept_encoding, can_decode, decode
+from . import hooks
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - aiohttp is an optional dependency
+    aiohttp = None
+
+_sessions = weakref.WeakKeyDictionary()
+
+
+class PendingRequest(BaseException):
+    """
+    Raised inside a replayed call when it reaches a request that has not been sent yet.
+
+    It derives from BaseException so the helpers' "except Exception" handlers let it through.
+
+    Attributes:
+        method (str): The HTTP method.
+        url (str): The URL of the request.
+        kwargs (dict): The remaining arguments of the request (params, headers, data, json).
+    """
+
+    def __init__(self, method, url, kwargs):
+        super().__init__(method, url)
+        self.method = method
+        self.url = url
+        self.kwargs = kwargs
+
+
+class Replay:
+    """
+    Feeds the responses gathered so far back into a synchronous call, in the order it asks for them.
+    """
+
+    def __init__(self):
+        self.results = []
+        self.position = 0
+
+    def send(self, method, url, session=None, **kwargs):
+        if self.position < len(self.results):
+            result = self.results[self.position]
+            self.position += 1
+            if isinstance(result, BaseException):
+                raise result
+            return result
+        raise PendingRequest(method, url, kwargs)
+
+
+def _require_aiohttp():
+    if aiohttp is None:
+        raise ImportError("The asynchronous API classes require aiohttp. Install it with: pip install nokey[async]")
+
+
+def get_async_session():
+    """
+    Returns the aiohttp session shared by the asynchronous API classes on the running event loop.
+
+    One session, and so one connection pool, is kept per event loop. It uses the same pool settings as the synchronous shared session.
+    It asks for the same compression as the synchronous session and decompresses bodies itself, so the bytes received can be counted.
+
+    Args:
+        None
+
+    Returns:
+        aiohttp.ClientSession: The shared session for the running loop.
+    """
+    _require_aiohttp()
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=_default_options["pool_connections"] * _default_options["pool_maxsize"],
+            limit_per_host=_default_options["pool_maxsize"],
+            keepalive_timeout=_default_options["idle_timeout"],
+        )
+        session = aiohttp.ClientSession(connector=connector, headers={"Accept-Encoding": accept_encoding()}, auto_decompress=False, trace_configs=[_trace_config()])
+        _sessions[loop] = session
+    return session
+
+
+async def close_async_session():
+    """
+    Closes the shared aiohttp session of the running event loop. Call this before the loop shuts down.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+def _trace_config():
+    # Times the phases of requests sent with a Timings object as their trace_request_ctx.
+    async def on_request_start(session, context, params):
+        context.request_start = time.perf_counter()
+
+    async def on_dns_resolvehost_start(session, context, params):
+        context.dns_start = time.perf_counter()
+
+    async def on_dns_resolvehost_end(session, context, params):
+        if context.trace_request_ctx is not None:
+            context.trace_request_ctx.dns = time.perf_counter() - context.dns_start
+
+    async def on_connection_create_start(session, context, params):
+        context.connect_start = time.perf_counter()
+
+    async def on_connection_create_end(session, context, params):
+        timings = context.trace_request_ctx
+        if timings is not None:
+            # Name resolution happens while the connection is created; it is reported separately.
+            timings.connect = time.perf_counter() - context.connect_start - (timings.dns or 0.0)
+
+    async def on_request_end(session, context, params):
+        if context.trace_request_ctx is not None:
+            context.trace_request_ctx.ttfb = time.perf_counter() - context.request_start
+
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(on_request_start)
+    config.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+    config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    config.on_connection_create_start.append(on_connection_create_start)
+    config.on_connection_create_end.append(on_connection_create_end)
+    config.on_request_end.append(on_request_end)
+    return config
+
+
+def _client_timeout(timeout):
+    if timeout is None:
+        return aiohttp.ClientTimeout()
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+    else:
+        connect = read = timeout
+    return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+
+
+async def _send_once(session, method, url, timeout, params, headers, data, json, timings=None):
+    started = time.perf_counter()
+    try:
+        async with session.request(method, url, params=params, headers=headers, data=data, json=json, timeout=_client_timeout(timeout), trace_request_ctx=timings) as resp:
+            body = await resp.read()
+    except asyncio.TimeoutError as err:
+        raise Timeout(f"Request to {url} timed out.") from err
+    except aiohttp.ClientError as err:
+        raise RequestsConnectionError(str(err)) from err
+    response = requests.Response()
+    content_encoding = resp.headers.get("Content-Encoding")
+    if not session.auto_decompress:
+        response.wire_bytes = len(body)
+        if can_decode(content_encoding):
+            try:
+                body = decode(body, content_encoding)
+            except Exception as err:
+                raise requests.exceptions.ContentDecodingError(f"Received response with content-encoding: {content_encoding}, but failed to decode it.") from err
+    response.status_code = resp.status
+    response.reason = resp.reason
+    response.url = str(resp.url)
+    response.headers = CaseInsensitiveDict(resp.headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.elapsed = datetime.timedelta(seconds=time.perf_counter() - started)
+    response._content = body
+    response._content_consumed = True
+    return response
+
+
+async def send(method, url, session=None, timeout=DEFAULT_TIMEOUT, retry=DEFAULT_RETRY, coalesce=True, conditional=False, params=None, headers=None, data=None, json=None, stream=False, call=None,
+               destination=None, chunk_size=mr.DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    Send a request with aiohttp and return it as a requests.Response, so the synchronous helpers can read it.
+    Failed attempts are retried according to the retry policy, and identical requests in flight on the
+    same event loop share one upstream call, as in the synchronous helpers.
+
+    With a destination, the body is instead written to it chunk by chunk as it arrives, and the number of
+    bytes written is returned. Such downloads are sent once, without retries or coalescing.
+
+    Args:
+        method (str): The HTTP method.
+        url (str): The URL of the request.
+        session (aiohttp.ClientSession, optional): The session to send the request with. Defaults to the shared session of the running loop.
+        timeout (float or tuple): Seconds to wait for the server, or a (connect, read) tuple.
+        retry (RetryPolicy): How failed requests are retried.
+        coalesce (bool): Whether an identical request already in flight is joined instead of sent again.
+        conditional (bool): Whether a GET repeats the validators of the last response and reuses its body on 304 Not Modified.
+        params (dict, optional): Query string parameters.
+        headers (dict, optional): Headers to be included in the request.
+        data (dict, optional): Form data to be sent in the request body.
+        json (dict, optional): JSON to be sent in the request body.
+        stream (bool): Accepted for compatibility with the synchronous helpers. The body is always read in full; use stream_content or a destination to read it in chunks.
+        call (ClientCall, optional): The API class method call making the request. Its class's rate limit applies, and it is reported to the request hooks.
+        destination (str, os.PathLike or file-like, optional): Where to write the body of a GET request, instead of returning it.
+        chunk_size (int): The size of each chunk written to the destination, in bytes. Default is 64 KiB.
+        progress (callable, optional): Called after each chunk written with the bytes written so far and the total size, or None if the size is unknown.
+
+    Returns:
+        requests.Response: The response, with its body already read. With a destination, the number of bytes written.
+    """
+    if session is None:
+        session = get_async_session()
+    if destination is not None:
+        return await _download(session, url, destination, params, headers, chunk_size, progress, timeout, mr._call_throttle(call))
+    key = request_key(method, url, session, params=params, headers=headers, data=data, json=json) if coalesce or conditional else None
+    validator_key = key if conditional and method == "GET" else None
+    throttle = mr._call_throttle(call)
+    if coalesce:
+        response, error, info = await async_single_flight().do(key, lambda: _send_conditionally(session, method, url, timeout, retry, params, headers, data, json, validator_key, throttle))
+    else:
+        response, error, info = await _send_conditionally(session, method, url, timeout, retry, params, headers, data, json, validator_key, throttle)
+    mr._last_request_info.set(info)
+    if hooks._subscribers:
+        hooks.emit_request(call, method, url, {"data": data, "json": json}, response, error, info)
+    if error is not None:
+        raise error
+    return response
+
+
+async def _send_conditionally(session, method, url, timeout, retry, params, headers, data, json, validator_key, throttle=None):
+    if validator_key is None:
+        return await _send_with_retries(session, method, url, timeout, retry, params, headers, data, json, throttle)
+    entry = validator_store.get(validator_key)
+    if entry is not None:
+        headers = entry.request_headers(headers)
+    response, error, info = await _send_with_retries(session, method, url, timeout, retry, params, headers, data, json, throttle)
+    if response is not None:
+        if response.status_code == 304 and entry is not None:
+            response = entry.to_response(response)
+        else:
+            remember(validator_key, response)
+    return response, error, info
+
+
+async def _send_with_retries(session, method, url, timeout, retry, params, headers, data, json, throttle=None):
+    info = RequestInfo(method, url)
+    throttler, cost, schedule = throttle if throttle is not None else (None, 0, None)
+    if throttler is not None and not await throttler.scheduler.acquire_async(cost, schedule):
+        return None, mr._dropped(info), info
+    if hooks._subscribers:
+        info.timings = hooks.Timings()
+    started = time.monotonic()
+    while True:
+        info.attempts += 1
+        response, error = None, None
+        try:
+            response = await _send_once(session, method, url, timeout, params, headers, data, json, info.timings)
+        except (RequestsConnectionError, Timeout) as err:
+            error = err
+        # A cached response carries the rate limit headers of when it was stored, which say nothing about now.
+        if throttler is not None and response is not None and not getattr(response, "from_cache", False):
+            throttler.observe(response.status_code, response.headers)
+        delay = retry.next_delay(method, info.attempts, response, error, time.monotonic() - started)
+        if delay is None:
+            break
+        if throttler is not None and mr._past_deadline(schedule, delay):
+            break
+        await asyncio.sleep(delay)
+        info.backoff_time += delay
+        if throttler is not None and not await throttler.scheduler.acquire_async(cost, schedule):
+            break
+        info.retries += 1
+    info.elapsed = time.monotonic() - started
+    info.status_code = response.status_code if response is not None else None
+    if response is not None:
+        mr._record_body(info, response)
+    return response, error, info
+
+
+async def stream_content(url, params=None, headers=None, chunk_size=mr.DEFAULT_CHUNK_SIZE, progress=None, session=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Make a request and yield the body in chunks as it arrives, without reading it all into memory.
+
+    Args:
+        url (str): The URL of the request.
+        params (dict, optional): Query string parameters.
+        headers (dict, optional): Headers to be included in the request.
+        chunk_size (int): The size of each chunk in bytes. Default is 64 KiB.
+        progress (callable, optional): Called after each chunk with the bytes read so far and the total size, or None if the size is unknown.
+        session (aiohttp.ClientSession, optional): The session to send the request with. Defaults to the shared session of the running loop.
+        timeout (float or tuple): Seconds to wait for the server, or a (connect, read) tuple.
+
+    Returns:
+        async generator: The body of the response, as chunks of bytes.
+
+    Raises:
+        requests.exceptions.RequestException: If the request fails or the API returns an error status.
+    """
+    if session is None:
+        session = get_async_session()
+    try:
+        async with session.get(url, params=params, headers=headers, timeout=_client_timeout(timeout)) as resp:
+            if resp.status >= 400:
+                raise requests.exceptions.HTTPError(f"{resp.status} Error: {resp.reason} for url: {resp.url}")
+            content_encoding = resp.headers.get("Content-Encoding")
+            total = resp.content_length if content_encoding is None else None
+            decoder = Decoder(content_encoding) if not session.auto_decompress and can_decode(content_encoding) else None
+            done = 0
+            async for chunk in resp.content.iter_chunked(chunk_size):
+                if decoder is not None:
+                    chunk = decoder.decompress(chunk)
+                    if not chunk:
+                        continue
+                done += len(chunk)
+                if progress is not None:
+                    progress(done, total)
+                yield chunk
+            if decoder is not None:
+                chunk = decoder.flush()
+                if chunk:
+                    done += len(chunk)
+                    if progress is not None:
+                        progress(done, total)
+                    yield chunk
+    except asyncio.TimeoutError as err:
+        raise Timeout(f"Request to {url} timed out.") from err
+    except aiohttp.ClientError as err:
+        raise RequestsConnectionError(str(err)) from err
+
+
+async def _download(session, url, destination, params, headers, chunk_size, progress, timeout, throttle=None):
+    # Stream a body to a path or file-like object, holding one chunk at a time. A partly written file is removed if the download fails.
+    throttler, cost, schedule = throttle if throttle is not None else (None, 0, None)
+    if throttler is not None and not await throttler.scheduler.acquire_async(cost, schedule):
+        raise mr._dropped(RequestInfo("GET", url))
+    chunks = stream_content(url, params, headers, chunk_size, progress, session, timeout)
+    if hasattr(destination, "write"):
+        return await _write_chunks(chunks, destination)
+    try:
+        with open(destination, "wb") as f:
+            return await _write_chunks(chunks, f)
+    except BaseException:
+        await chunks.aclose()
+        if os.path.exists(destination):
+            os.remove(destination)
+        raise
+
+
+async def _write_chunks(chunks, f):
+    written = 0
+    async for chunk in chunks:
+        f.write(chunk)
+        written += len(chunk)
+    return written
+
+
+async def run_sync(func, *args, session=None, **kwargs):
+    """
+    Run a synchronous nokey function, sending each of its requests asynchronously.
+
+    The function is run until it asks for a request that has not been sent. That request is awaited and
+    the function is run again, getting earlier responses back in order, until it returns. The function
+    must make the same requests in the same order each time, which holds for every API class method.
+
+    Each run repeats the work done before the requests already answered, such as decoding their responses,
+    so a function making n requests does that work about n * n / 2 times. This is cheap for the API class
+    methods, which make one request or a few, but makes this a poor fit for long multi-request functions.
+
+    Args:
+        func: The synchronous function to run.
+        *args: Positional arguments for the function.
+        session (aiohttp.ClientSession, optional): The session to send requests with.
+        **kwargs: Keyword arguments for the function.
+
+    Returns:
+        The return value of the function.
+    """
+    replay = Replay()
+    while True:
+        replay.position = 0
+        token = _current_replay.set(replay)
+        try:
+            return func(*args, **kwargs)
+        except PendingRequest as pending:
+            request = pending
+        finally:
+            _current_replay.reset(token)
+        try:
+            result = await send(request.method, request.url, session=session, **request.kwargs)
+        except Exception as err:
+            result = err
+        replay.results.append(result)
+
+
+def _async_version(func):
+    async def wrapper(*args, **kwargs):
+        return await run_sync(func, *args, **kwargs)
+    wrapper.__name__ = func.__name__
+    wrapper.__qualname__ = func.__qualname__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+make_request = _async_version(mr.make_request)
+make_request_with_params = _async_version(mr.make_request_with_params)
+make_request_for_content = _async_version(mr.make_request_for_content)
+make_request_for_content_with_params = _async_version(mr.make_request_for_content_with_params)
+make_request_with_post_and_data = _async_version(mr.make_request_with_post_and_data)
+make_request_with_post_and_json = _async_version(mr.make_request_with_post_and_json)
+make_request_for_response = _async_version(mr.make_request_for_response)
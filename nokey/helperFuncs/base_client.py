@@ -0,0 +1,162 @@
+from contextvars import ContextVar
+from functools import wraps
+from types import FunctionType
+from . session import get_session
+from . batch import map_calls, DEFAULT_CONCURRENCY
+from . retry import DEFAULT_TIMEOUT, DEFAULT_RETRY
+from . scheduler import NORMAL
+
+_current_call = ContextVar("nokey_current_call", default=None)
+_current_replay = ContextVar("nokey_current_replay", default=None)
+
+
+class ClientCall:
+    """
+    Records which API class method is currently running, so the request helpers can use that client's settings.
+
+    Attributes:
+        client: The API class instance.
+        method_name (str): The name of the method being called.
+        args (tuple): The positional arguments the method was called with.
+        kwargs (dict): The keyword arguments the method was called with.
+    """
+    __slots__ = ("client", "method_name", "args", "kwargs")
+
+    def __init__(self, client, method_name, args, kwargs):
+        self.client = client
+        self.method_name = method_name
+        self.args = args
+        self.kwargs = kwargs
+
+
+def current_call():
+    """
+    Returns the ClientCall for the API class method running in this context, or None outside of one.
+    """
+    return _current_call.get()
+
+
+def current_replay():
+    """
+    Returns the Replay feeding responses to a call run by the asynchronous transport, or None for ordinary synchronous calls.
+    """
+    return _current_replay.get()
+
+
+def current_session():
+    """
+    Returns the session the running API class method should use: its own if it was given one, otherwise the shared pooled session.
+    """
+    call = _current_call.get()
+    if call is not None and call.client.session is not None:
+        return call.client.session
+    return get_session()
+
+
+def bind_client(func):
+    """
+    Wrap an API class method so the request helpers it calls know which client and method they belong to.
+
+    Args:
+        func: The method to wrap.
+
+    Returns:
+        func: The wrapped method.
+    """
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        token = _current_call.set(ClientCall(self, func.__name__, args, kwargs))
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            _current_call.reset(token)
+    wrapper.__nokey_bound__ = True
+    return wrapper
+
+
+class BaseClient:
+    """
+    Base class for all of the API classes.
+
+    Public methods defined on a subclass are wrapped with bind_client so that every request they make
+    goes through the client's own session, or the shared pooled session when it has none.
+
+    Attributes:
+        session (requests.Session): The session used for this client's requests. None means the shared pooled session.
+        timeout (float or tuple): Seconds to wait for the server, or a (connect, read) tuple. Default is (5, 30).
+        retry (RetryPolicy): How failed requests are retried. Set to retry.NO_RETRY to disable retries.
+        coalesce (bool): Whether identical requests in flight at the same time share one upstream call. Default is True.
+        conditional (bool): Whether GET requests are made conditional on the ETag/Last-Modified of the last response, reusing
+            its decoded body on 304 Not Modified. Reused bodies are shared between calls and should not be modified. Default is False.
+        raise_errors (bool): Whether failed requests raise a NokeyError (RequestTimeout, RateLimited, HTTPStatusError, ...)
+            instead of returning an error dictionary. Default is False.
+        priority (int): Where the requests of a rate-limited class queue for its limit: scheduler.INTERACTIVE, NORMAL or BULK.
+            Requests of different client instances with the same priority take turns. Default is NORMAL.
+        deadline (float): Seconds a request of a rate-limited class may wait for its limit before it is dropped without being sent,
+            failing with DeadlineExceeded. Default is None, which waits as long as needed.
+        cache_ttl (dict): How long responses are cached when the client caches, by method name or URL pattern, e.g.
+            {"get_active_alerts": 30, "get_*_by_id": cache_policy.DAY, "api.example.com/live/": cache_policy.NEVER_CACHE}.
+            Requests matching no rule use the cache's expire_after. See cache_policy.cache_ttl. Default is no rules.
+        memory_cache (bool): Whether responses of a caching client are also kept in memory, so repeated requests skip
+            the persistent cache. See memory_cache.MemoryCache. Default is True.
+        shared_results (bool): Whether results answered from the memory cache are one decoded object shared by every call,
+            which also skips the JSON decoding. Callers must then not modify them. Default is False, a new copy per call.
+        stale_while_revalidate (float): Seconds past its expiry that a response in the memory cache may still be returned,
+            while it is refreshed in the background. Older responses are fetched again before returning. Default is None, never stale.
+        negative_ttl (float): Seconds a caching client remembers that a lookup found nothing (a 404 or 410, or an empty result),
+            answering repeats of it from memory. Timeouts and server errors are never remembered. None turns this off. Default is 60.
+    """
+    session = None
+    timeout = DEFAULT_TIMEOUT
+    retry = DEFAULT_RETRY
+    coalesce = True
+    conditional = False
+    raise_errors = False
+    priority = NORMAL
+    deadline = None
+    cache_ttl = {}
+    memory_cache = True
+    shared_results = False
+    stale_while_revalidate = None
+    negative_ttl = 60
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for attr_name, attr in list(vars(cls).items()):
+            if attr_name.startswith("_") or not isinstance(attr, FunctionType) or getattr(attr, "__nokey_bound__", False):
+                continue
+            setattr(cls, attr_name, bind_client(attr))
+
+    def map(self, method, iterable, concurrency=DEFAULT_CONCURRENCY, ordered=True):
+        """
+        Call one of this client's methods once per item, on a bounded pool of worker threads.
+
+        The class's rate limit is shared by the workers, so throttled classes stay within it.
+
+        Args:
+            method (str or callable): The name of a method of this client, or a function taking one item.
+            iterable: The items to call the method with.
+            concurrency (int): The number of worker threads. Default is 8.
+            ordered (bool): If True, results are yielded in input order. If False, they are yielded as they complete.
+
+        Returns:
+            generator: BatchResult tuples (index, item, result, error), one per item. A call that raised has its exception in error instead of stopping the batch.
+        """
+        func = getattr(self, method) if isinstance(method, str) else method
+        return map_calls(func, iterable, concurrency=concurrency, ordered=ordered)
+
+    def starmap(self, method, iterable, concurrency=DEFAULT_CONCURRENCY, ordered=True):
+        """
+        Like map, but each item is a tuple of arguments, e.g. (country, zipcode) for Zippopotomus.get_info_by_zipcode.
+
+        Args:
+            method (str or callable): The name of a method of this client, or a function.
+            iterable: Tuples of arguments to call the method with.
+            concurrency (int): The number of worker threads. Default is 8.
+            ordered (bool): If True, results are yielded in input order. If False, they are yielded as they complete.
+
+        Returns:
+            generator: BatchResult tuples (index, item, result, error), one per item.
+        """
+        func = getattr(self, method) if isinstance(method, str) else method
+        return map_calls(lambda args: func(*args), iterable, concurrency=concurrency, ordered=ordered)
@@ -0,0 +1,109 @@
+import asyncio
+import contextvars
+import itertools
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+DEFAULT_CONCURRENCY = 8
+
+BatchResult = namedtuple("BatchResult", ["index", "item", "result", "error"])
+BatchResult.__doc__ = """
+The outcome of one call in a batch.
+
+Attributes:
+    index (int): The position of the item in the input.
+    item: The item the call was made with.
+    result: The return value of the call, or None if it raised.
+    error (Exception): The exception the call raised, or None if it succeeded.
+"""
+
+
+def _call(func, index, item):
+    try:
+        return BatchResult(index, item, func(item), None)
+    except Exception as err:
+        return BatchResult(index, item, None, err)
+
+
+def map_calls(func, iterable, concurrency=DEFAULT_CONCURRENCY, ordered=True):
+    """
+    Call a function once per item on a bounded pool of worker threads.
+
+    Items are read from the iterable lazily, so at most a couple of calls per worker are queued at once.
+    An exception raised by one call is returned in its BatchResult and does not stop the others.
+    Each call runs in a copy of the caller's context, so request_options set around the batch apply to it.
+
+    Args:
+        func: The function to call with each item.
+        iterable: The items.
+        concurrency (int): The number of worker threads. Default is 8.
+        ordered (bool): If True, results are yielded in input order. If False, they are yielded as they complete.
+
+    Returns:
+        generator: BatchResult tuples, one per item.
+    """
+    items = enumerate(iterable)
+    window = max(1, concurrency) * 2
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        pending = deque(executor.submit(contextvars.copy_context().run, _call, func, index, item) for index, item in itertools.islice(items, window))
+        try:
+            while pending:
+                if ordered:
+                    done = [pending.popleft()]
+                    yield done[0].result()
+                else:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    done = [future for future in pending if future in finished]
+                    for future in done:
+                        pending.remove(future)
+                        yield future.result()
+                for index, item in itertools.islice(items, len(done)):
+                    pending.append(executor.submit(contextvars.copy_context().run, _call, func, index, item))
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+async def _acall(func, index, item, semaphore):
+    async with semaphore:
+        try:
+            return BatchResult(index, item, await func(item), None)
+        except Exception as err:
+            return BatchResult(index, item, None, err)
+
+
+async def amap_calls(func, iterable, concurrency=DEFAULT_CONCURRENCY, ordered=True):
+    """
+    Await a coroutine function once per item, with at most concurrency calls running at a time.
+
+    An exception raised by one call is returned in its BatchResult and does not stop the others.
+
+    Args:
+        func: The coroutine function to call with each item.
+        iterable: The items.
+        concurrency (int): The maximum number of calls in flight. Default is 8.
+        ordered (bool): If True, results are yielded in input order. If False, they are yielded as they complete.
+
+    Returns:
+        async generator: BatchResult tuples, one per item.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    items = enumerate(iterable)
+    window = max(1, concurrency) * 2
+    pending = deque(asyncio.ensure_future(_acall(func, index, item, semaphore)) for index, item in itertools.islice(items, window))
+    try:
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+                yield await done[0]
+            else:
+                finished, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                done = [task for task in pending if task in finished]
+                for task in done:
+                    pending.remove(task)
+                    yield task.result()
+            for index, item in itertools.islice(items, len(done)):
+                pending.append(asyncio.ensure_future(_acall(func, index, item, semaphore)))
+    finally:
+        for task in pending:
+            task.cancel()
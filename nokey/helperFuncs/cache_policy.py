@@ -0,0 +1,50 @@
+from fnmatch import fnmatchcase
+from requests_cache import CacheMixin, DO_NOT_CACHE, NEVER_EXPIRE
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+NEVER_CACHE = DO_NOT_CACHE
+FOREVER = NEVER_EXPIRE
+
+
+def cache_ttl(call, url):
+    """
+    Returns how long the response to a request should be cached, by the cache_ttl rules of the API class making it.
+
+    The rules are a dictionary of patterns to expiry times (seconds, a datetime.timedelta, NEVER_CACHE or FOREVER).
+    A pattern without "/" is matched against the name of the API class method, and may use wildcards,
+    e.g. "get_*_by_id". A pattern with "/" is matched against the start of the URL, without its scheme, as in
+    requests_cache's urls_expire_after, e.g. "api.weather.gov/alerts/active". A rule for the exact method name
+    wins; otherwise the first matching pattern does.
+
+    Args:
+        call (ClientCall): The API class method call making the request, or None.
+        url (str): The URL of the request, without params passed separately.
+
+    Returns:
+        The expiry of the matching rule, or None if no rule matches and the cache's own expire_after applies.
+    """
+    rules = call.client.cache_ttl if call is not None else None
+    if not rules:
+        return None
+    if call.method_name in rules:
+        return rules[call.method_name]
+    bare_url = None
+    for pattern, ttl in rules.items():
+        if "/" in pattern:
+            if bare_url is None:
+                bare_url = url.split("://", 1)[-1]
+            if fnmatchcase(bare_url, pattern.split("://", 1)[-1].rstrip("*") + "*"):
+                return ttl
+        elif fnmatchcase(call.method_name, pattern):
+            return ttl
+    return None
+
+
+def is_cached(session):
+    """
+    Returns whether a session caches responses with requests_cache, and so accepts a per-request expire_after.
+    """
+    return isinstance(session, CacheMixin)
@@ -0,0 +1,168 @@
+import zlib
+from urllib3.util.request import ACCEPT_ENCODING
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is an optional dependency
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    from compression import zstd
+except ImportError:  # pragma: no cover - zstd is in the standard library from Python 3.14
+    try:
+        from backports import zstd
+    except ImportError:
+        zstd = None
+
+_preferred = ("zstd", "br", "gzip", "deflate")
+# urllib3 decodes the bodies of synchronous requests, so only what it can decode is advertised.
+_decodable = {name.strip() for name in ACCEPT_ENCODING.split(",")}
+if brotli is None:
+    _decodable.discard("br")
+if zstd is None:
+    _decodable.discard("zstd")
+
+ENCODINGS = tuple(name for name in _preferred if name in _decodable)
+
+
+def accept_encoding():
+    """
+    Returns the Accept-Encoding header sent with requests: every encoding that can be decoded, best compression first.
+
+    brotli ("br") and zstd are offered when Brotli and, before Python 3.14, backports.zstd are installed (pip install nokey[compression]).
+
+    Args:
+        None
+
+    Returns:
+        str: The header value, e.g. "zstd, br, gzip, deflate".
+    """
+    return ", ".join(ENCODINGS)
+
+
+class _DeflateDecoder:
+    # "deflate" is meant to be zlib-wrapped, but some servers send a raw deflate stream.
+    def __init__(self):
+        self._obj = zlib.decompressobj()
+        self._first = True
+
+    def decompress(self, data):
+        if not self._first:
+            return self._obj.decompress(data)
+        self._first = False
+        try:
+            return self._obj.decompress(data)
+        except zlib.error:
+            self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+            return self._obj.decompress(data)
+
+    def flush(self):
+        return self._obj.flush()
+
+
+class _BrotliDecoder:
+    def __init__(self):
+        decompressor = brotli.Decompressor()
+        self.decompress = getattr(decompressor, "process", None) or decompressor.decompress
+
+
+def _decoder_for(encoding):
+    if encoding == "gzip" or encoding == "x-gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return _DeflateDecoder()
+    if encoding == "br" and brotli is not None:
+        return _BrotliDecoder()
+    if encoding == "zstd" and zstd is not None:
+        return zstd.ZstdDecompressor()
+    raise ValueError(f"Cannot decode Content-Encoding {encoding!r}")
+
+
+class Decoder:
+    """
+    Incrementally decodes a body sent with the given Content-Encoding.
+
+    Args:
+        content_encoding (str): The Content-Encoding header, e.g. "gzip" or "gzip, br". None or "identity" passes the body through.
+    """
+
+    def __init__(self, content_encoding):
+        names = [name.strip().lower() for name in (content_encoding or "").split(",")]
+        # Encodings are listed in the order they were applied, so they are undone in reverse.
+        self._decoders = [_decoder_for(name) for name in reversed(names) if name and name != "identity"]
+
+    def decompress(self, data):
+        """
+        Returns the decoded bytes available after feeding data.
+        """
+        for decoder in self._decoders:
+            data = decoder.decompress(data)
+        return data
+
+    def flush(self):
+        """
+        Returns whatever decoded bytes are left at the end of the body.
+        """
+        data = b""
+        for decoder in self._decoders:
+            if data:
+                data = decoder.decompress(data)
+            flush = getattr(decoder, "flush", None)
+            if flush is not None:
+                data += flush()
+        return data
+
+
+def can_decode(content_encoding):
+    """
+    Returns whether a body sent with the given Content-Encoding can be decoded.
+    """
+    try:
+        Decoder(content_encoding)
+    except ValueError:
+        return False
+    return True
+
+
+def decode(body, content_encoding):
+    """
+    Decode a whole body sent with the given Content-Encoding.
+
+    Args:
+        body (bytes): The body as received.
+        content_encoding (str): The Content-Encoding header, or None.
+
+    Returns:
+        bytes: The decoded body.
+    """
+    decoder = Decoder(content_encoding)
+    if not decoder._decoders:
+        return body
+    return decoder.decompress(body) + decoder.flush()
+
+
+def body_sizes(response):
+    """
+    Returns how many bytes of a response's body came over the network and how many they decoded to.
+
+    Responses served from the requests_cache cache count zero bytes received.
+
+    Args:
+        response (requests.Response): A response whose body has been read.
+
+    Returns:
+        tuple: (bytes received, bytes decoded). Bytes received is None when it cannot be told.
+    """
+    decoded = len(response.content)
+    if getattr(response, "from_cache", False):
+        return 0, decoded
+    received = getattr(response, "wire_bytes", None)
+    if received is None:
+        try:
+            received = response.raw.tell()
+        except (AttributeError, TypeError, OSError):
+            received = None
+    return received, decoded
@@ -0,0 +1,148 @@
+import threading
+from collections import OrderedDict
+import requests
+
+DEFAULT_MAX_ENTRIES = 1024
+
+# The parsed value of an entry whose body has not been decoded yet.
+UNSET = object()
+
+
+class ValidatorEntry:
+    """
+    The validators and body of the last full response for one request.
+
+    Attributes:
+        etag (str): The ETag header of the response, or None.
+        last_modified (str): The Last-Modified header of the response, or None.
+        content (bytes): The body of the response.
+        headers (dict): The headers of the response.
+        parsed: The decoded body, filled in the first time it is decoded.
+    """
+    __slots__ = ("etag", "last_modified", "content", "headers", "parsed")
+
+    def __init__(self, etag, last_modified, content, headers):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content = content
+        self.headers = headers
+        self.parsed = UNSET
+
+    def request_headers(self, headers=None):
+        """
+        Returns a copy of the request headers with If-None-Match and If-Modified-Since added from this entry.
+        """
+        headers = dict(headers or {})
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self, not_modified):
+        """
+        Returns a 200 response carrying the stored body, built from the 304 response that confirmed it is still current.
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = not_modified.url
+        response.headers = requests.structures.CaseInsensitiveDict(self.headers)
+        response.headers.update(not_modified.headers)
+        response.encoding = not_modified.encoding or requests.utils.get_encoding_from_headers(response.headers)
+        response.elapsed = not_modified.elapsed
+        response.request = not_modified.request
+        response._content = self.content
+        response._content_consumed = True
+        response.from_validator_store = True
+        response.validator_entry = self
+        return response
+
+
+class ValidatorStore:
+    """
+    A thread-safe, size-bounded store of ValidatorEntry objects, dropping the least recently used first.
+
+    Attributes:
+        max_entries (int): The most entries kept.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+validator_store = ValidatorStore()
+
+
+def remember(key, response, store=validator_store):
+    """
+    Store the validators and body of a successful response, if it has an ETag or Last-Modified header.
+
+    Args:
+        key: The request key.
+        response (requests.Response): The response, with its body read.
+        store (ValidatorStore): Where to keep the entry. Defaults to the shared store.
+
+    Returns:
+        ValidatorEntry: The new entry, or None if the response had no validators.
+    """
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if response.status_code != 200 or (etag is None and last_modified is None):
+        store.discard(key)
+        return None
+    entry = ValidatorEntry(etag, last_modified, response.content, dict(response.headers))
+    store.put(key, entry)
+    response.validator_entry = entry
+    return entry
+
+
+def decode_once(response, decode):
+    """
+    Decode a response body, reusing the decoded body shared through the memory cache or stored with its validators when there is one.
+
+    Such bodies are the same object on every call, so they should not be modified.
+
+    Args:
+        response (requests.Response): The response.
+        decode (callable): Decodes a response body.
+
+    Returns:
+        The decoded body.
+    """
+    memory_entry = getattr(response, "memory_entry", None)
+    if memory_entry is not None and memory_entry.parsed is not UNSET:
+        return memory_entry.parsed
+    entry = getattr(response, "validator_entry", None)
+    if entry is None:
+        return decode(response)
+    if entry.parsed is UNSET:
+        entry.parsed = decode(response)
+    return entry.parsed
@@ -0,0 +1,125 @@
+from requests.exceptions import HTTPError, JSONDecodeError, RequestException, Timeout
+from . retry import parse_retry_after
+
+
+class NokeyError(Exception):
+    """
+    Base class for the errors raised by the request helpers when raise_errors is on.
+
+    Attributes:
+        url (str): The URL of the request.
+        status_code (int): The HTTP status code of the response, or None if no response was received.
+        info (RequestInfo): Attempts, retries and timing of the request, or None if it was never sent.
+        elapsed (float): Total seconds spent on the request, or None if it was never sent.
+    """
+
+    def __init__(self, message, url=None, status_code=None, info=None):
+        super().__init__(message)
+        self.url = url
+        self.status_code = status_code
+        self.info = info
+
+    @property
+    def elapsed(self):
+        return self.info.elapsed if self.info is not None else None
+
+
+class RequestTimeout(NokeyError):
+    """
+    The API did not answer within the timeout, on every attempt.
+    """
+
+
+class TransportError(NokeyError):
+    """
+    The request could not be sent or the response could not be read, e.g. because the connection failed.
+    """
+
+
+class HTTPStatusError(NokeyError):
+    """
+    The API answered with a 4xx or 5xx status.
+
+    Attributes:
+        message (str): The "message" field of the error body, if the API sent one.
+        response (requests.Response): The response.
+    """
+
+    def __init__(self, message, url=None, status_code=None, info=None, response=None, api_message=None):
+        super().__init__(message, url, status_code, info)
+        self.response = response
+        self.message = api_message
+
+
+class NotFound(HTTPStatusError):
+    """
+    The API answered 404 Not Found.
+    """
+
+
+class RateLimited(HTTPStatusError):
+    """
+    The API answered 429 Too Many Requests.
+
+    Attributes:
+        retry_after (float): Seconds the API asked to wait before trying again, or None if it did not say.
+    """
+
+    def __init__(self, *args, retry_after=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.retry_after = retry_after
+
+
+class DecodeError(NokeyError):
+    """
+    The response body could not be decoded.
+    """
+
+
+class DeadlineExceeded(NokeyError):
+    """
+    The request was dropped without being sent, because its deadline came before its API class's rate limit allowed it.
+    """
+
+
+def error_message(response, decode):
+    """
+    Returns the "message" field of an error response body, or None if the body is not JSON or has no message.
+    """
+    try:
+        body = decode(response)
+    except ValueError:
+        return None
+    return body.get("message") if isinstance(body, dict) else None
+
+
+def from_request_error(err, response=None, info=None, decode=None):
+    """
+    Convert an exception raised while making a request into the matching NokeyError.
+
+    Args:
+        err (Exception): The exception.
+        response (requests.Response, optional): The response, if one was received.
+        info (RequestInfo, optional): Attempts, retries and timing of the request.
+        decode (callable, optional): Decodes a response body, used to read the API's error message.
+
+    Returns:
+        NokeyError: The converted error, or None if err is not a request error.
+    """
+    url = info.url if info is not None else getattr(response, "url", None)
+    status_code = response.status_code if response is not None else None
+    if isinstance(err, Timeout):
+        return RequestTimeout(str(err) or "Request timed out.", url, status_code, info)
+    if isinstance(err, HTTPError) and response is not None:
+        api_message = error_message(response, decode) if decode is not None else None
+        kwargs = {"url": url, "status_code": status_code, "info": info, "response": response, "api_message": api_message}
+        if status_code == 429:
+            return RateLimited(str(err), retry_after=parse_retry_after(response.headers.get("Retry-After")), **kwargs)
+        if status_code == 404:
+            return NotFound(str(err), **kwargs)
+        return HTTPStatusError(str(err), **kwargs)
+    if isinstance(err, JSONDecodeError):
+        return DecodeError(str(err), url, status_code, info)
+    if isinstance(err, RequestException):
+        return TransportError(str(err), url, status_code, info)
+    return None
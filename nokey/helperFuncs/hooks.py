@@ -0,0 +1,303 @@
+import inspect
+import json
+import threading
+import warnings
+from contextvars import ContextVar
+from urllib.parse import urlencode, urlsplit, urlunsplit, parse_qsl, quote
+
+_subscribers = ()
+_throttle_subscribers = ()
+_lock = threading.Lock()
+_current_timings = ContextVar("nokey_current_timings", default=None)
+_signatures = {}
+
+
+class Timings:
+    """
+    How long the network phases of a request took, in seconds. Each is None when it was not measured,
+    for example connect and tls when an open connection was reused.
+
+    Attributes:
+        dns (float): Resolving the host name. Only measured by the asynchronous transport; the synchronous one counts it in connect.
+        connect (float): Opening the TCP connection.
+        tls (float): The TLS handshake. Only measured by the synchronous transport; the asynchronous one counts it in connect.
+        ttfb (float): From sending the request to receiving the response headers.
+    """
+    __slots__ = ("dns", "connect", "tls", "ttfb")
+
+    def __init__(self):
+        self.dns = None
+        self.connect = None
+        self.tls = None
+        self.ttfb = None
+
+    def __repr__(self):
+        return f"Timings(dns={self.dns}, connect={self.connect}, tls={self.tls}, ttfb={self.ttfb})"
+
+
+class RequestEvent:
+    """
+    What one request made by a request helper did, as passed to subscribers.
+
+    Attributes:
+        client (str): The name of the API class that made the request, or None if it was made directly.
+        method_name (str): The name of the API class method that made the request, or None.
+        http_method (str): The HTTP method.
+        url (str): The URL of the request, without params passed separately.
+        url_template (str): The URL with the values of the method's arguments replaced by {argument name}, e.g. ".../PublicHolidays/{year}/{country_code}".
+        status_code (int): The status code of the response, or None if no response was received.
+        error (Exception): The exception the request failed with, or None.
+        timings (Timings): DNS, connect, TLS and time-to-first-byte timings.
+        total (float): Total seconds spent on the request, including retries.
+        bytes_sent (int): Bytes in the request body.
+        bytes_received (int): Bytes of the response body that came over the network, or None if unknown.
+        bytes_decoded (int): Bytes of the response body after decompression, or None if unknown.
+        cache_hit (bool): Whether the body came from the requests_cache cache or the conditional request store.
+        attempts (int): How many times the request was sent.
+        retries (int): How many of those attempts were retries.
+    """
+    __slots__ = ("client", "method_name", "http_method", "url", "url_template", "status_code", "error", "timings", "total",
+                 "bytes_sent", "bytes_received", "bytes_decoded", "cache_hit", "attempts", "retries")
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    def __repr__(self):
+        return f"RequestEvent({', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)})"
+
+
+class ThrottleEvent:
+    """
+    One request's pass through an API class's rate limiter, as passed to throttle subscribers.
+
+    Attributes:
+        client (str): The name of the throttled API class.
+        wait (float): Seconds the request waited for the rate limit, including time queued behind other requests. 0.0 if it went straight through.
+    """
+    __slots__ = ("client", "wait")
+
+    def __init__(self, client, wait):
+        self.client = client
+        self.wait = wait
+
+    def __repr__(self):
+        return f"ThrottleEvent(client={self.client!r}, wait={self.wait})"
+
+
+def subscribe(callback):
+    """
+    Call a function with a RequestEvent after every request made by the request helpers, from any API class.
+
+    The callback runs in the thread (or task) that made the request, so it should be quick. Exceptions it raises are turned into warnings.
+    Can be used as a decorator.
+
+    Args:
+        callback (callable): Called with one RequestEvent.
+
+    Returns:
+        callable: The callback, unchanged.
+    """
+    global _subscribers
+    with _lock:
+        _subscribers = _subscribers + (callback,)
+    return callback
+
+
+def unsubscribe(callback):
+    """
+    Stop calling a function subscribed with subscribe. Does nothing if it is not subscribed.
+
+    Args:
+        callback (callable): The subscribed function.
+
+    Returns:
+        None
+    """
+    global _subscribers
+    with _lock:
+        _subscribers = tuple(subscriber for subscriber in _subscribers if subscriber is not callback)
+
+
+def subscribe_throttle(callback):
+    """
+    Call a function with a ThrottleEvent every time a request of a rate-limited API class passes its rate limiter.
+
+    Args:
+        callback (callable): Called with one ThrottleEvent.
+
+    Returns:
+        callable: The callback, unchanged.
+    """
+    global _throttle_subscribers
+    with _lock:
+        _throttle_subscribers = _throttle_subscribers + (callback,)
+    return callback
+
+
+def unsubscribe_throttle(callback):
+    """
+    Stop calling a function subscribed with subscribe_throttle. Does nothing if it is not subscribed.
+
+    Args:
+        callback (callable): The subscribed function.
+
+    Returns:
+        None
+    """
+    global _throttle_subscribers
+    with _lock:
+        _throttle_subscribers = tuple(subscriber for subscriber in _throttle_subscribers if subscriber is not callback)
+
+
+def active():
+    """
+    Returns whether any subscriber is attached. Timings are only measured while one is.
+    """
+    return bool(_subscribers)
+
+
+def record_connection(connect=None, tls=None, dns=None):
+    """
+    Record the timings of a connection opened for the request being timed in this context, if any.
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        return
+    if dns is not None:
+        timings.dns = dns
+    if connect is not None:
+        timings.connect = connect
+    if tls is not None:
+        timings.tls = tls
+
+
+def url_template(call, url):
+    """
+    Returns the URL with the path segments and query values that equal an argument of the API class method
+    replaced by {argument name}, so calls to one endpoint share one template.
+
+    Args:
+        call (ClientCall): The API class method call that made the request, or None.
+        url (str): The URL of the request.
+
+    Returns:
+        str: The URL template, or the URL itself if there is no call.
+    """
+    if call is None:
+        return url
+    names = {}
+    for name, value in _arguments(call).items():
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            continue
+        text = str(value)
+        if text:
+            names.setdefault(text, name)
+            names.setdefault(quote(text, safe=""), name)
+    if not names:
+        return url
+    parts = urlsplit(url)
+    path = "/".join("{%s}" % names[segment] if segment in names else segment for segment in parts.path.split("/"))
+    query = parts.query
+    if query:
+        query = "&".join(f"{key}={{{names[value]}}}" if value in names else urlencode({key: value})
+                         for key, value in parse_qsl(query, keep_blank_values=True))
+    return urlunsplit((parts.scheme, parts.netloc, path, query, parts.fragment))
+
+
+def _arguments(call):
+    cls = type(call.client)
+    key = (cls, call.method_name)
+    signature = _signatures.get(key)
+    if signature is None:
+        signature = _signatures[key] = inspect.signature(getattr(cls, call.method_name))
+    try:
+        bound = signature.bind(call.client, *call.args, **call.kwargs)
+    except TypeError:
+        return {}
+    bound.apply_defaults()
+    arguments = dict(bound.arguments)
+    arguments.pop(next(iter(signature.parameters)), None)
+    return arguments
+
+
+def _body_length(kwargs):
+    body = kwargs.get("json")
+    if body is not None:
+        return len(json.dumps(body, allow_nan=False).encode("utf-8"))
+    body = kwargs.get("data")
+    if body is None:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    try:
+        return len(urlencode(body, doseq=True))
+    except TypeError:
+        return None
+
+
+def emit_request(call, method, url, kwargs, response, error, info):
+    """
+    Build the RequestEvent of a finished request and pass it to every subscriber.
+
+    Args:
+        call (ClientCall): The API class method call that made the request, or None.
+        method (str): The HTTP method.
+        url (str): The URL of the request.
+        kwargs (dict): The params, headers, data and json of the request.
+        response (requests.Response): The response, or None.
+        error (Exception): The exception the request failed with, or None.
+        info (RequestInfo): Attempts, retries, timings and sizes of the request.
+
+    Returns:
+        None
+    """
+    subscribers = _subscribers
+    if not subscribers:
+        return
+    event = RequestEvent(
+        client=type(call.client).__name__ if call is not None else None,
+        method_name=call.method_name if call is not None else None,
+        http_method=method,
+        url=url,
+        url_template=url_template(call, url),
+        status_code=info.status_code,
+        error=error,
+        timings=info.timings or Timings(),
+        total=info.elapsed,
+        bytes_sent=_body_length(kwargs),
+        bytes_received=info.bytes_received,
+        bytes_decoded=info.bytes_decoded,
+        cache_hit=response is not None and bool(getattr(response, "from_cache", False) or getattr(response, "from_validator_store", False)),
+        attempts=info.attempts,
+        retries=info.retries,
+    )
+    for callback in subscribers:
+        try:
+            callback(event)
+        except Exception as err:
+            warnings.warn(f"nokey request hook {callback!r} raised {err!r}", RuntimeWarning, stacklevel=2)
+
+
+def emit_throttle(client, wait):
+    """
+    Pass a ThrottleEvent to every throttle subscriber.
+
+    Args:
+        client (str): The name of the throttled API class.
+        wait (float): Seconds the call waited.
+
+    Returns:
+        None
+    """
+    subscribers = _throttle_subscribers
+    if not subscribers:
+        return
+    event = ThrottleEvent(client, wait)
+    for callback in subscribers:
+        try:
+            callback(event)
+        except Exception as err:
+            warnings.warn(f"nokey throttle hook {callback!r} raised {err!r}", RuntimeWarning, stacklevel=2)
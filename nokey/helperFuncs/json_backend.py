@@ -0,0 +1,104 @@
+import json
+from requests.exceptions import JSONDecodeError
+from . conditional import decode_once
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+_backends = {"json": json.loads}
+if ujson is not None:
+    _backends["ujson"] = ujson.loads
+if orjson is not None:
+    _backends["orjson"] = orjson.loads
+
+_preferred = ("orjson", "ujson", "json")
+backend = next(name for name in _preferred if name in _backends)
+_loads = _backends[backend]
+
+
+def available_backends():
+    """
+    Returns the names of the JSON decoders that can be used, fastest first.
+
+    Args:
+        None
+
+    Returns:
+        list: Backend names, out of "orjson", "ujson" and "json".
+    """
+    return [name for name in _preferred if name in _backends]
+
+
+def set_backend(name):
+    """
+    Choose the JSON decoder used by the request helpers. By default the fastest installed one is used.
+
+    Args:
+        name (str): "orjson", "ujson" or "json".
+
+    Returns:
+        None
+    """
+    global backend, _loads
+    if name not in _backends:
+        raise ValueError(f"JSON backend {name!r} is not available. Available backends: {', '.join(available_backends())}")
+    backend = name
+    _loads = _backends[name]
+
+
+def loads(data):
+    """
+    Decode a JSON document with the selected backend.
+
+    Args:
+        data (bytes or str): The JSON document.
+
+    Returns:
+        The decoded object.
+    """
+    return _loads(data)
+
+
+def decode_response(response):
+    """
+    Decode the JSON body of a response with the selected backend.
+
+    The body is decoded straight from bytes. Bodies that are not UTF-8 fall back to response.json(),
+    which detects the encoding itself. Errors are raised as requests' JSONDecodeError, as response.json() does.
+    Responses remembered for conditional requests are decoded once, and that object is returned again afterwards.
+
+    Args:
+        response (requests.Response): The response to decode.
+
+    Returns:
+        The decoded object.
+    """
+    return decode_once(response, decode_body)
+
+
+def decode_body(response):
+    """
+    Decode the JSON body of a response with the selected backend, every time, unlike decode_response.
+
+    Args:
+        response (requests.Response): The response to decode.
+
+    Returns:
+        The decoded object.
+    """
+    content = response.content
+    if response.encoding not in (None, "utf-8", "UTF-8", "utf8"):
+        return response.json()
+    try:
+        return _loads(content)
+    except ValueError as err:
+        if isinstance(err, UnicodeDecodeError):
+            return response.json()
+        raise JSONDecodeError(str(err), content.decode("utf-8", "replace"), 0) from err
@@ -1,7 +1,326 @@
-import requests
-from requests.exceptions import HTTPError, Timeout, RequestException
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from requests.exceptions import HTTPError, Timeout, RequestException, ConnectionError
+from . base_client import current_call, current_session, current_replay
+from . json_backend import decode_response
+from . retry import DEFAULT_TIMEOUT, DEFAULT_RETRY, RequestInfo
+from . single_flight import SingleFlight, request_key
+from . conditional import validator_store, remember
+from . exceptions import from_request_error, error_message, DeadlineExceeded
+from . compression import body_sizes
+from . cache_policy import cache_ttl, is_cached, NEVER_CACHE
+from . memory_cache import memory_cache, remember_response
+from . throttler import cost_of
+from . scheduler import Schedule
+from . import hooks
 
-def make_request(url, headers=None, payload=None):
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_request_options = ContextVar("nokey_request_options", default={})
+_last_request_info = ContextVar("nokey_last_request_info", default=None)
+_flight = SingleFlight()
+
+@contextmanager
+def request_options(timeout=None, retry=None, coalesce=None, conditional=None, raise_errors=None, priority=None, caller=None, deadline=None):
+    """
+    Override the timeout, retry policy, request coalescing, conditional requests, error handling and rate limit scheduling for the requests made inside the with block, whichever API class makes them.
+    
+    Args:
+        timeout (float or tuple, optional): Seconds to wait for the server, or a (connect, read) tuple.
+        retry (RetryPolicy, optional): The retry policy to use. Pass retry.NO_RETRY to disable retries.
+        coalesce (bool, optional): Whether identical requests in flight at the same time share one upstream call.
+        conditional (bool, optional): Whether GET requests send the ETag/Last-Modified of the last response and reuse its body on 304 Not Modified.
+        raise_errors (bool, optional): Whether failed requests raise a NokeyError instead of returning an error dictionary.
+        priority (int, optional): Where requests queue for rate limits: scheduler.INTERACTIVE, NORMAL or BULK.
+        caller (optional): Who the requests are made for, e.g. a user or job id. Callers with the same priority take turns. Defaults to the client instance.
+        deadline (float, optional): Seconds from entering the block by which requests must have passed their rate limit.
+            Requests that cannot are dropped without being sent, failing with DeadlineExceeded. A nested block cannot extend it.
+    
+    Returns:
+        None
+    """
+    options = dict(_request_options.get())
+    if timeout is not None:
+        options["timeout"] = timeout
+    if retry is not None:
+        options["retry"] = retry
+    if coalesce is not None:
+        options["coalesce"] = coalesce
+    if conditional is not None:
+        options["conditional"] = conditional
+    if raise_errors is not None:
+        options["raise_errors"] = raise_errors
+    if priority is not None:
+        options["priority"] = priority
+    if caller is not None:
+        options["caller"] = caller
+    if deadline is not None:
+        deadline = time.monotonic() + deadline
+        options["deadline"] = min(deadline, options.get("deadline", deadline))
+    token = _request_options.set(options)
+    try:
+        yield
+    finally:
+        _request_options.reset(token)
+
+def last_request_info():
+    """
+    Returns the RequestInfo of the last request sent in this thread or task, with its attempt count, retries and time spent waiting.
+    
+    Args:
+        None
+    
+    Returns:
+        RequestInfo: Details of the last request, or None if no request has been sent.
+    """
+    return _last_request_info.get()
+
+def _resolve_options(timeout, retry):
+    # A per-call value wins over request_options, which wins over the API class's own settings.
+    options = _request_options.get()
+    call = current_call()
+    client = call.client if call is not None else None
+    if timeout is None:
+        timeout = options.get("timeout", client.timeout if client is not None else DEFAULT_TIMEOUT)
+    if retry is None:
+        retry = options.get("retry", client.retry if client is not None else DEFAULT_RETRY)
+    coalesce = options.get("coalesce", client.coalesce if client is not None else True)
+    conditional = options.get("conditional", client.conditional if client is not None else False)
+    return timeout, retry, coalesce, conditional
+
+def _raise_errors():
+    options = _request_options.get()
+    if "raise_errors" in options:
+        return options["raise_errors"]
+    call = current_call()
+    return call is not None and call.client.raise_errors
+
+def _check_status(response):
+    # Helpers that hand back error bodies as they are only check the status when errors are raised.
+    if response.status_code >= 400 and _raise_errors():
+        response.raise_for_status()
+
+def _failure(err, response=None, with_message=False):
+    """
+    Turn an exception caught by a helper into its result: a NokeyError is raised if raise_errors is on,
+    otherwise an error dictionary is returned. The error body is decoded at most once.
+    """
+    if _raise_errors():
+        error = from_request_error(err, response, _last_request_info.get(), decode_response)
+        if error is None:
+            raise err
+        raise error from err
+    if isinstance(err, HTTPError):
+        if with_message:
+            return {"error": f"HTTP error occurred: {err}", "message": error_message(response, decode_response)}
+        return {"error": f"HTTP error occurred: {err}"}
+    if isinstance(err, Timeout):
+        return {"error": "Request timed out."}
+    if isinstance(err, DeadlineExceeded):
+        return {"error": str(err)}
+    if isinstance(err, RequestException):
+        return {"error": f"Request exception occurred: {err}"}
+    return {"error": f"An unexpected error occurred: {err}"}
+
+def _send(method, url, session=None, timeout=None, retry=None, **kwargs):
+    """
+    Send a request over the given session, or over the session of the API class making the call.
+    Unless a class was given its own session, this is the shared pooled session, so connections
+    to each host are kept alive and reused between calls. Inside a call run by the asynchronous
+    transport the request is handed to it instead.
+    
+    Failed attempts are retried according to the retry policy, waiting with jittered exponential
+    backoff or as long as the server's Retry-After header asks.
+    
+    Identical requests (same method, URL, params, headers and body) made from several threads at
+    the same time are sent once, and every caller gets that one response. Streamed requests are
+    always sent on their own.
+    
+    With conditional requests on, a GET repeats the ETag/Last-Modified of the last response to it,
+    and a 304 Not Modified is answered with the stored body instead of downloading it again.
+    
+    Over a requests_cache session, the response is cached for as long as the API class's cache_ttl rules say.
+    Streamed responses are never cached, so their body is not read into memory.
+    Unless the API class turns memory_cache off, successful GET responses from it are also kept in the
+    in-process memory cache with their decoded body, and answered from there, without sending or throttling,
+    until they expire. If the class allows stale_while_revalidate, an entry that expired less than that many
+    seconds ago is still answered from memory while one background request per entry refreshes it.
+    Lookups that found nothing (404, 410 or an empty result) are answered from memory for the class's
+    negative_ttl; timeouts and server errors are always sent again.
+    
+    Each finished request is reported to the subscribers of hooks.subscribe, if there are any.
+    
+    Requests made for a rate-limited API class that the cache cannot answer wait for its throttler before each attempt, in the order
+    its scheduler gives by priority and caller, and are dropped if their deadline passes first. Every
+    response is shown to the throttler, so it can follow the limits the upstream reports.
+    """
+    timeout, retry, coalesce, conditional = _resolve_options(timeout, retry)
+    replay = current_replay()
+    if replay is not None:
+        return replay.send(method, url, session, timeout=timeout, retry=retry, coalesce=coalesce, conditional=conditional, call=current_call(), **kwargs)
+    if session is None:
+        session = current_session()
+    stream = kwargs.get("stream", False)
+    memory_key = None
+    if is_cached(session):
+        call = current_call()
+        # requests_cache reads a whole body to store it, so streamed downloads bypass the cache.
+        ttl = NEVER_CACHE if stream else cache_ttl(call, url)
+        if ttl is not None:
+            kwargs["expire_after"] = ttl
+        if method == "GET" and not stream and ttl != NEVER_CACHE and (call is None or call.client.memory_cache):
+            memory_key = request_key(method, url, session, **kwargs)
+            max_stale = call.client.stale_while_revalidate if call is not None else None
+            entry = memory_cache.get(memory_key, max_stale or 0)
+            if entry is not None:
+                if entry.expired():
+                    refresh_kwargs = dict(kwargs)
+                    memory_cache.refresh(memory_key, lambda: _fetch(method, url, session, timeout, retry, coalesce, conditional, memory_key, refresh_kwargs))
+                return _from_memory(method, url, kwargs, entry, call is not None and call.client.shared_results)
+    return _fetch(method, url, session, timeout, retry, coalesce, conditional, memory_key, kwargs)
+
+def _fetch(method, url, session, timeout, retry, coalesce, conditional, memory_key, kwargs):
+    # Send a request that the memory cache did not answer, and keep its response there if it can be.
+    stream = kwargs.get("stream", False)
+    throttle = _call_throttle(current_call())
+    key = memory_key or (request_key(method, url, session, **kwargs) if (coalesce or conditional) and not stream else None)
+    conditional = conditional and key is not None and method == "GET"
+    if coalesce and key is not None:
+        response, error, info = _flight.do(key, lambda: _send_conditionally(session, method, url, timeout, retry, kwargs, key if conditional else None, throttle))
+    else:
+        response, error, info = _send_conditionally(session, method, url, timeout, retry, kwargs, key if conditional else None, throttle)
+    if memory_key is not None and response is not None and getattr(response, "memory_entry", None) is None:
+        call = current_call()
+        if call is not None:
+            remember_response(memory_key, response, session, call.client.negative_ttl, call.client.shared_results)
+        else:
+            remember_response(memory_key, response, session)
+    _last_request_info.set(info)
+    if hooks._subscribers:
+        hooks.emit_request(current_call(), method, url, kwargs, response, error, info)
+    if error is not None:
+        raise error
+    return response
+
+def _from_memory(method, url, kwargs, entry, shared=False):
+    # A response answered by the memory cache: nothing is sent, so no attempts are counted.
+    response = entry.to_response(shared)
+    info = RequestInfo(method, url)
+    info.status_code = entry.status_code
+    info.bytes_decoded = len(entry.content)
+    _last_request_info.set(info)
+    if hooks._subscribers:
+        hooks.emit_request(current_call(), method, url, kwargs, response, None, info)
+    return response
+
+def _call_throttle(call):
+    # Requests made by a method of a rate-limited API class take (throttler, cost, schedule) from its budget.
+    if call is None:
+        return None
+    throttler = getattr(type(call.client), "_throttler", None)
+    return (throttler, cost_of(call), _schedule(call.client)) if throttler is not None else None
+
+def _schedule(client):
+    # request_options wins over the client's priority; the earlier of the two deadlines applies.
+    options = _request_options.get()
+    deadline = options.get("deadline")
+    if client.deadline is not None:
+        own = time.monotonic() + client.deadline
+        deadline = own if deadline is None else min(deadline, own)
+    return Schedule(options.get("priority", client.priority), options.get("caller", client), deadline)
+
+def _dropped(info):
+    return DeadlineExceeded("Request dropped: its deadline passed before the rate limit allowed it.", info.url, None, info)
+
+def _send_conditionally(session, method, url, timeout, retry, kwargs, validator_key, throttle=None):
+    if validator_key is None:
+        return _send_with_retries(session, method, url, timeout, retry, kwargs, throttle)
+    entry = validator_store.get(validator_key)
+    if entry is not None:
+        kwargs = dict(kwargs, headers=entry.request_headers(kwargs.get("headers")))
+    response, error, info = _send_with_retries(session, method, url, timeout, retry, kwargs, throttle)
+    if response is not None:
+        if response.status_code == 304 and entry is not None:
+            response = entry.to_response(response)
+            info.bytes_decoded = len(response.content)
+        else:
+            remember(validator_key, response)
+    return response, error, info
+
+def _send_with_retries(session, method, url, timeout, retry, kwargs, throttle=None):
+    info = RequestInfo(method, url)
+    throttler, cost, schedule = throttle if throttle is not None else (None, 0, None)
+    if throttler is not None:
+        # A request the persistent cache can answer is not sent, so it takes no slot of the rate limit.
+        started = time.monotonic()
+        cached = _cached_response(session, method, url, timeout, kwargs)
+        if cached is not None:
+            info.attempts = 1
+            info.elapsed = time.monotonic() - started
+            info.status_code = cached.status_code
+            _record_body(info, cached)
+            return cached, None, info
+        if not throttler.scheduler.acquire(cost, schedule):
+            return None, _dropped(info), info
+    if hooks._subscribers:
+        info.timings = hooks.Timings()
+        token = hooks._current_timings.set(info.timings)
+    started = time.monotonic()
+    try:
+        while True:
+            info.attempts += 1
+            response, error = None, None
+            try:
+                response = session.request(method, url, timeout=timeout, **kwargs)
+            except (ConnectionError, Timeout) as err:
+                error = err
+            # A cached response carries the rate limit headers of when it was stored, which say nothing about now.
+            if throttler is not None and response is not None and not getattr(response, "from_cache", False):
+                throttler.observe(response.status_code, response.headers)
+            delay = retry.next_delay(method, info.attempts, response, error, time.monotonic() - started)
+            if delay is None:
+                break
+            # A retry is another call against the rate limit, so it takes its slot once the backoff is over.
+            # If the backoff would run past the deadline, or the slot comes too late, the last attempt stands.
+            if throttler is not None and _past_deadline(schedule, delay):
+                break
+            time.sleep(delay)
+            info.backoff_time += delay
+            if throttler is not None and not throttler.scheduler.acquire(cost, schedule):
+                break
+            if response is not None:
+                response.close()
+            info.retries += 1
+    finally:
+        if info.timings is not None:
+            hooks._current_timings.reset(token)
+    if info.timings is not None and response is not None:
+        info.timings.ttfb = response.elapsed.total_seconds()
+    info.elapsed = time.monotonic() - started
+    info.status_code = response.status_code if response is not None else None
+    if response is not None and not kwargs.get("stream"):
+        _record_body(info, response)
+    return response, error, info
+
+def _past_deadline(schedule, delay):
+    # Whether waiting delay seconds would take a request past its deadline, so a retry could no longer be sent.
+    remaining = schedule.remaining()
+    return remaining is not None and delay >= remaining
+
+def _cached_response(session, method, url, timeout, kwargs):
+    # The fresh response requests_cache holds for the request, or None. It answers a miss with a 504 instead of sending.
+    if not is_cached(session) or kwargs.get("stream"):
+        return None
+    response = session.request(method, url, timeout=timeout, only_if_cached=True, **kwargs)
+    return response if response.from_cache and response.status_code != 504 else None
+
+def _record_body(info, response):
+    info.content_encoding = response.headers.get("Content-Encoding")
+    info.bytes_received, info.bytes_decoded = body_sizes(response)
+
+def make_request(url, headers=None, payload=None, session=None):
     """
     Make an HTTP request to the specified URL with optional headers and payload.
     
@@ -9,33 +328,28 @@ def make_request(url, headers=None, payload=None):
         url (str): The URL of the API endpoint.
         headers (dict, optional): Headers to be included in the request.
         payload (dict, optional): The payload to be sent in the request body.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared pooled session.
         
     Returns:
         dict: A dictionary containing the response data or error information.
+    
+    Raises:
+        NokeyError: If raise_errors is on and the request fails. The error carries the status code and timing.
     """
+    response = None
     try:
         if payload is not None:
-            response = requests.post(url, headers=headers, json=payload)
+            response = _send("POST", url, session, headers=headers, json=payload)
         else:
-            response = requests.get(url, headers=headers)
+            response = _send("GET", url, session, headers=headers)
         
         response.raise_for_status()  # Raise an exception for 4xx or 5xx status codes
-        return response.json()  # Return JSON response
-    except HTTPError as http_err:
-        # Handle HTTP error
-        return {"error": f"HTTP error occurred: {http_err}", "message": response.json()["message"] if "message" in response.json() else None}
-    except Timeout:
-        # Handle timeout error
-        return {"error": "Request timed out."}
-    except RequestException as req_err:
-        # Handle other request exceptions
-        return {"error": f"Request exception occurred: {req_err}"}
+        return decode_response(response)  # Return JSON response
     except Exception as err:
-        # Handle any other unexpected errors
-        return {"error": f"An unexpected error occurred: {err}"}
+        return _failure(err, response, with_message=True)
 
 
-def make_request_with_params(url, params, headers=None):
+def make_request_with_params(url, params, headers=None, session=None):
     """
     Make a request to an API if the API call requires params.
     
@@ -45,24 +359,19 @@ def make_request_with_params(url, params, headers=None):
     
     Returns:
         dict: A dictionary containing either the response data or an error message.
+    
+    Raises:
+        NokeyError: If raise_errors is on and the request fails. The error carries the status code and timing.
     """
+    response = None
     try:
-        response = requests.get(url, params, headers=headers)
-        return response.json()
-    except HTTPError as http_err:
-        # Handle HTTP error
-        return {"error": f"HTTP error occurred: {http_err}", "message": response.json()["message"] if "message" in response.json() else None}
-    except Timeout:
-        # Handle timeout error
-        return {"error": "Request timed out."}
-    except RequestException as req_err:
-        # Handle other request exceptions
-        return {"error": f"Request exception occurred: {req_err}"}
+        response = _send("GET", url, session, params=params, headers=headers)
+        _check_status(response)
+        return decode_response(response)
     except Exception as err:
-        # Handle any other unexpected errors
-        return {"error": f"An unexpected error occurred: {err}"}
+        return _failure(err, response, with_message=True)
         
-def make_request_for_content(url, headers=None):
+def make_request_for_content(url, headers=None, session=None):
     """
     Make a request to an API if the API call returns content other than in JSON format.
     
@@ -71,24 +380,19 @@ def make_request_for_content(url, headers=None):
     
     Returns:
         string: Text in any format containing either the response data or an error message.
+    
+    Raises:
+        NokeyError: If raise_errors is on and the request fails. The error carries the status code and timing.
     """
+    response = None
     try:
-        response = requests.get(url, headers=headers)
+        response = _send("GET", url, session, headers=headers)
+        _check_status(response)
         return response.content
-    except HTTPError as http_err:
-        # Handle HTTP error
-        return {"error": f"HTTP error occurred: {http_err}"}
-    except Timeout:
-        # Handle timeout error
-        return {"error": "Request timed out."}
-    except RequestException as req_err:
-        # Handle other request exceptions
-        return {"error": f"Request exception occurred: {req_err}"}
     except Exception as err:
-        # Handle any other unexpected errors
-        return {"error": f"An unexpected error occurred: {err}"}
+        return _failure(err, response)
         
-def make_request_for_content_with_params(url, params, headers=None):
+def make_request_for_content_with_params(url, params, headers=None, session=None):
     """
     Make a request to an API if the API call returns content other than in JSON format.
     
@@ -97,25 +401,20 @@ def make_request_for_content_with_params(url, params, headers=None):
     
     Returns:
         string: Text in any format containing either the response data or an error message.
+    
+    Raises:
+        NokeyError: If raise_errors is on and the request fails. The error carries the status code and timing.
     """
+    response = None
     try:
-        response = requests.get(url, params, headers=headers)
+        response = _send("GET", url, session, params=params, headers=headers)
+        _check_status(response)
         return response.content
-    except HTTPError as http_err:
-        # Handle HTTP error
-        return {"error": f"HTTP error occurred: {http_err}"}
-    except Timeout:
-        # Handle timeout error
-        return {"error": "Request timed out."}
-    except RequestException as req_err:
-        # Handle other request exceptions
-        return {"error": f"Request exception occurred: {req_err}"}
     except Exception as err:
-        # Handle any other unexpected errors
-        return {"error": f"An unexpected error occurred: {err}"}
+        return _failure(err, response)
         
         
-def make_request_with_post_and_data(url, data):
+def make_request_with_post_and_data(url, data, session=None):
     """
     Make a request to an API if the API using the POST method.
     
@@ -125,24 +424,19 @@ def make_request_with_post_and_data(url, data):
     
     Returns:
         dict: A dictionary containing either the response data or an error message.
+    
+    Raises:
+        NokeyError: If raise_errors is on and the request fails. The error carries the status code and timing.
     """
+    response = None
     try:
-        response = requests.post(url, data=data)
-        return response.json()
-    except HTTPError as http_err:
-        # Handle HTTP error
-        return {"error": f"HTTP error occurred: {http_err}", "message": response.json()["message"] if "message" in response.json() else None}
-    except Timeout:
-        # Handle timeout error
-        return {"error": "Request timed out."}
-    except RequestException as req_err:
-        # Handle other request exceptions
-        return {"error": f"Request exception occurred: {req_err}"}
+        response = _send("POST", url, session, data=data)
+        _check_status(response)
+        return decode_response(response)
     except Exception as err:
-        # Handle any other unexpected errors
-        return {"error": f"An unexpected error occurred: {err}"}
+        return _failure(err, response, with_message=True)
         
-def make_request_with_post_and_json(url, json):
+def make_request_with_post_and_json(url, json, session=None):
     """
     Make a request to an API if the API using the POST method.
     
@@ -152,22 +446,158 @@ def make_request_with_post_and_json(url, json):
     
     Returns:
         dict: A dictionary containing either the response data or an error message.
+    
+    Raises:
+        NokeyError: If raise_errors is on and the request fails. The error carries the status code and timing.
     """
+    response = None
     try:
-        response = requests.post(url, json=json)
-        return response.json()
-    except HTTPError as http_err:
-        # Handle HTTP error
-        return {"error": f"HTTP error occurred: {http_err}", "message": response.json()["message"] if "message" in response.json() else None}
-    except Timeout:
-        # Handle timeout error
-        return {"error": "Request timed out."}
-    except RequestException as req_err:
-        # Handle other request exceptions
-        return {"error": f"Request exception occurred: {req_err}"}
+        response = _send("POST", url, session, json=json)
+        _check_status(response)
+        return decode_response(response)
+    except Exception as err:
+        return _failure(err, response, with_message=True)
+        
+def make_request_for_content_stream(url, params=None, headers=None, chunk_size=DEFAULT_CHUNK_SIZE, progress=None, session=None):
+    """
+    Make a request to an API and read the body in chunks, so large downloads are never held in memory at once.
+    
+    The request is sent straight away. The body is read as the returned generator is consumed, and the
+    connection is released when the generator is exhausted or closed.
+    
+    Args:
+        url (str): The url of the API.
+        params (dict, optional): The params to be included in the request.
+        headers (dict, optional): Headers to be included in the request.
+        chunk_size (int): The size of each chunk in bytes. Default is 64 KiB.
+        progress (callable, optional): Called after each chunk with the bytes read so far and the total size, or None if the size is unknown.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared pooled session.
+    
+    Returns:
+        generator: The body of the response, as chunks of bytes.
+    
+    Raises:
+        requests.exceptions.RequestException: If the request fails or the API returns an error status.
+    """
+    response = _send("GET", url, session, params=params, headers=headers, stream=True)
+    try:
+        response.raise_for_status()
+    except HTTPError:
+        response.close()
+        raise
+    return iter_response_content(response, chunk_size, progress)
+
+def iter_response_content(response, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    Read the body of a streamed response in chunks, reporting progress, and release the connection at the end.
+    
+    Args:
+        response (requests.Response): A response requested with stream=True.
+        chunk_size (int): The size of each chunk in bytes. Default is 64 KiB.
+        progress (callable, optional): Called after each chunk with the bytes read so far and the total size, or None if the size is unknown.
+    
+    Returns:
+        generator: The body of the response, as chunks of bytes.
+    """
+    length = response.headers.get("Content-Length", "")
+    # Content-Length counts encoded bytes, which differs from what iter_content yields for compressed bodies.
+    total = int(length) if length.isdigit() and "Content-Encoding" not in response.headers else None
+    done = 0
+    with response:
+        for chunk in response.iter_content(chunk_size):
+            done += len(chunk)
+            if progress is not None:
+                progress(done, total)
+            yield chunk
+
+def write_response_content(response, destination, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    Write the body of a streamed response to a path or file-like object, one chunk at a time.
+    
+    A partly written file is removed if reading the body fails.
+    
+    Args:
+        response (requests.Response): A response requested with stream=True.
+        destination (str, os.PathLike or file-like): Where to write the body.
+        chunk_size (int): The size of each chunk in bytes. Default is 64 KiB.
+        progress (callable, optional): Called after each chunk with the bytes written so far and the total size, or None if the size is unknown.
+    
+    Returns:
+        int: The number of bytes written.
+    """
+    chunks = iter_response_content(response, chunk_size, progress)
+    if hasattr(destination, "write"):
+        return _write_chunks(chunks, destination)
+    try:
+        with open(destination, "wb") as f:
+            return _write_chunks(chunks, f)
+    except BaseException:
+        chunks.close()
+        if os.path.exists(destination):
+            os.remove(destination)
+        raise
+
+def _write_chunks(chunks, f):
+    written = 0
+    for chunk in chunks:
+        f.write(chunk)
+        written += len(chunk)
+    return written
+
+def make_request_for_content_to_file(url, destination, params=None, headers=None, chunk_size=DEFAULT_CHUNK_SIZE, progress=None, session=None):
+    """
+    Make a request to an API and stream the body to a path or file-like object, holding at most one chunk in memory.
+    
+    Args:
+        url (str): The url of the API.
+        destination (str, os.PathLike or file-like): Where to write the body.
+        params (dict, optional): The params to be included in the request.
+        headers (dict, optional): Headers to be included in the request.
+        chunk_size (int): The size of each chunk in bytes. Default is 64 KiB.
+        progress (callable, optional): Called after each chunk with the bytes written so far and the total size, or None if the size is unknown.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared pooled session.
+    
+    Returns:
+        int: The number of bytes written, or a dictionary containing an error message.
+    
+    Raises:
+        NokeyError: If raise_errors is on and the request fails. The error carries the status code and timing.
+    """
+    replay = current_replay()
+    if replay is not None:
+        # An asynchronous call streams the body to the destination itself, and gets back the bytes written.
+        timeout = _resolve_options(None, None)[0]
+        try:
+            return replay.send("GET", url, session, timeout=timeout, params=params, headers=headers, call=current_call(),
+                               destination=destination, chunk_size=chunk_size, progress=progress)
+        except Exception as err:
+            return _failure(err)
+    response = None
+    try:
+        response = _send("GET", url, session, params=params, headers=headers, stream=True)
+        response.raise_for_status()
+        return write_response_content(response, destination, chunk_size, progress)
     except Exception as err:
-        # Handle any other unexpected errors
-        return {"error": f"An unexpected error occurred: {err}"}
+        if response is not None:
+            response.close()
+        return _failure(err, response)
+
+def make_request_for_response(url, method="GET", data=None, headers=None, stream=False, session=None):
+    """
+    Make a request to an API when the caller needs the full response object, e.g. to inspect the status code or headers.
+    
+    Args:
+        url (str): The url of the API.
+        method (str): The HTTP method to use. Default is GET.
+        data (dict, optional): Form data to be sent in the request body.
+        headers (dict, optional): Headers to be included in the request.
+        stream (bool): If True, the body is not read until the caller reads it, e.g. with write_response_content.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared pooled session.
+    
+    Returns:
+        requests.Response: The response from the API.
+    """
+    return _send(method, url, session, data=data, headers=headers, stream=stream)
         
 def add_params(params, params_list):
     """
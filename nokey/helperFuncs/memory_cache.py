@@ -0,0 +1,304 @@
+import contextvars
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import requests
+from . conditional import UNSET
+from . json_backend import decode_body
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+NOT_FOUND_STATUSES = (404, 410)
+
+
+class MemoryEntry:
+    """
+    A response from a requests_cache session, kept in memory with its decoded body.
+
+    Attributes:
+        status_code (int): The status code of the response.
+        reason (str): The reason phrase of the response.
+        url (str): The URL of the response.
+        content (bytes): The body of the response.
+        headers (dict): The headers of the response.
+        encoding (str): The encoding of the body, or None.
+        parsed: The decoded JSON body, kept for clients that share results, or unset.
+        expires (float): The time.monotonic() time at which the entry expires, or None if it never does.
+        size (int): Roughly how many bytes the entry holds, counting the body and the decoded objects.
+        negative (bool): Whether the response says that nothing was found, e.g. a 404 or an empty result.
+    """
+    __slots__ = ("status_code", "reason", "url", "content", "headers", "encoding", "parsed", "expires", "size", "negative")
+
+    def __init__(self, url, content, headers, encoding, parsed, expires, status_code=200, reason="OK", negative=False):
+        self.status_code = status_code
+        self.reason = reason
+        self.negative = negative
+        self.url = url
+        self.content = content
+        self.headers = headers
+        self.encoding = encoding
+        self.parsed = parsed
+        self.expires = expires
+        self.size = len(content) + deep_sizeof(headers) + (deep_sizeof(parsed) if parsed is not UNSET else 0)
+
+    def expired(self, now=None):
+        """
+        Returns whether the entry has expired.
+        """
+        return self.expires is not None and (now if now is not None else time.monotonic()) >= self.expires
+
+    def to_response(self, shared=False):
+        """
+        Returns a response carrying the stored status and body, marked as coming from the cache.
+        If shared, decoding it returns the stored decoded body rather than a new copy.
+        """
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.reason = self.reason
+        response.url = self.url
+        response.headers = requests.structures.CaseInsensitiveDict(self.headers)
+        response.encoding = self.encoding
+        response.elapsed = timedelta(0)
+        response._content = self.content
+        response._content_consumed = True
+        response.from_cache = True
+        if shared:
+            response.memory_entry = self
+        return response
+
+
+class MemoryCache:
+    """
+    A thread-safe, in-process cache of responses and their decoded bodies, bounded by size in bytes,
+    dropping the least recently used entries first.
+
+    It sits in front of the requests_cache sessions of the API classes, so repeated requests for hot keys
+    are answered without reading the persistent cache or unpickling the response. Each call decodes its own
+    copy of the body, unless the client shares results, in which case the decoded body is kept as well and
+    handed out without decoding.
+    Entries expire when the persistent cache entry they were copied from does.
+
+    Expired entries can still be served for a while, stale-while-revalidate, as long as one background
+    refresh per entry is under way (see refresh).
+
+    Negative entries remember that a lookup found nothing (a 404 or 410, or an empty result) for a short time
+    of their own, so repeated lookups of missing keys do not go upstream. They are never served stale.
+    Transient failures, such as timeouts and 5xx responses, are never kept.
+
+    Shared decoded bodies are the same object on every call, so they should not be modified.
+
+    Attributes:
+        max_bytes (int): Roughly the most bytes the entries may hold. 0 turns the cache off.
+        hits (int): Requests answered from memory.
+        stale_hits (int): How many of those were answered with an expired entry.
+        negative_hits (int): How many of those were answered with a negative entry.
+        misses (int): Requests that were not in memory.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.stale_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get(self, key, max_stale=0):
+        """
+        Returns the entry for a request key, or None if it is not in memory or expired more than max_stale seconds ago.
+
+        Args:
+            key: The request key.
+            max_stale (float): How many seconds past its expiry an entry that is not negative may still be returned. Default is 0.
+
+        Returns:
+            MemoryEntry: The entry, which may have expired if max_stale allows it, or None.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expired(now if entry.negative else now - max_stale):
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            if entry.negative:
+                self.negative_hits += 1
+            elif entry.expired(now):
+                self.stale_hits += 1
+            return entry
+
+    def refresh(self, key, fetch):
+        """
+        Refresh an entry in a background thread, unless a refresh of it is already running.
+
+        The fetch runs in a copy of the caller's context, so it is made for the same API class call and
+        request options. If it fails, the entry stays as it is and a later request tries again.
+
+        Args:
+            key: The request key.
+            fetch (callable): Sends the request again and stores the new response, without arguments.
+
+        Returns:
+            bool: True if a refresh was started, False if one was already running.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                fetch()
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=contextvars.copy_context().run, args=(run,), name="nokey-revalidate", daemon=True).start()
+        return True
+
+    def put(self, key, entry):
+        """
+        Store an entry, dropping the least recently used ones until the cache fits in max_bytes.
+        Entries bigger than max_bytes on their own are not stored.
+        """
+        with self._lock:
+            self._remove(key)
+            if entry.size > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def discard(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        """
+        Drop every entry, e.g. after clearing the persistent cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def stats(self):
+        """
+        Returns how full the cache is and how often it answered requests.
+
+        Args:
+            None
+
+        Returns:
+            dict: The entries, bytes, max_bytes, hits, stale_hits, negative_hits, misses and refreshing, the background refreshes running.
+        """
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes, "hits": self.hits,
+                    "stale_hits": self.stale_hits, "negative_hits": self.negative_hits, "misses": self.misses, "refreshing": len(self._refreshing)}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+memory_cache = MemoryCache()
+
+
+def remember_response(key, response, session, negative_ttl=None, shared=False, store=memory_cache):
+    """
+    Copy a response from a requests_cache session into memory, with its decoded body if shared and it is JSON.
+
+    Successful responses are only kept if the persistent cache holds them, for as long as it holds them, so
+    requests that its rules say not to cache (e.g. NEVER_CACHE) are never answered from memory.
+
+    With a negative_ttl, responses saying that nothing was found are kept as negative entries for that many
+    seconds: 404 and 410 responses, and successful ones with an empty body or an empty JSON list or object.
+    The persistent cache keeps empty results no longer than that either.
+
+    Args:
+        key: The request key.
+        response (requests.Response): The response, with its body read.
+        session (requests_cache.CachedSession): The session the response came from.
+        negative_ttl (float, optional): Seconds to keep responses that found nothing. None does not keep them.
+        shared (bool): Whether to keep the decoded body, to be handed out to every caller. Default is False.
+        store (MemoryCache): Where to keep the entry. Defaults to the shared cache.
+
+    Returns:
+        MemoryEntry: The new entry, or None if the response was not kept.
+    """
+    if store.max_bytes <= 0:
+        return None
+    not_found = response.status_code in NOT_FOUND_STATUSES
+    if not not_found and not 200 <= response.status_code < 300:
+        return None
+    cache_key = getattr(response, "cache_key", None)
+    stored = not not_found and cache_key is not None and (response.from_cache or session.cache.contains(key=cache_key))
+    if not stored and not not_found and response.content:
+        return None
+    parsed = UNSET
+    if shared and response.content and "json" in response.headers.get("Content-Type", ""):
+        try:
+            parsed = decode_body(response)
+        except ValueError:
+            return None
+    negative = not_found or response.content.strip() in (b"", b"[]", b"{}", b"null")
+    if negative and not negative_ttl:
+        if not stored:
+            return None
+        negative = False
+    if negative:
+        expires = time.monotonic() + negative_ttl
+        if stored and not response.from_cache:
+            # An empty result stays in the persistent cache no longer than in memory.
+            session.cache.save_response(response, cache_key, datetime.now(timezone.utc) + timedelta(seconds=negative_ttl))
+    else:
+        expires = getattr(response, "expires", None)
+        if expires is not None:
+            expires = time.monotonic() + (expires - datetime.now(timezone.utc)).total_seconds()
+    entry = MemoryEntry(response.url, response.content, dict(response.headers), response.encoding, parsed, expires,
+                        response.status_code, response.reason, negative)
+    store.put(key, entry)
+    if shared:
+        response.memory_entry = entry
+    return entry
+
+
+def deep_sizeof(obj):
+    """
+    Returns roughly how many bytes an object takes in memory, counting the containers and everything in them.
+
+    Args:
+        obj: A decoded JSON body, or any object made of dicts, lists, tuples and scalars.
+
+    Returns:
+        int: The size in bytes.
+    """
+    size = 0
+    seen = set()
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return size
@@ -0,0 +1,317 @@
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from . import hooks
+from . import throttler
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    """
+    A metric that only goes up, kept per combination of label values.
+
+    Attributes:
+        name (str): The metric name, without the _total suffix.
+        help (str): What the metric counts.
+        labelnames (tuple): The names of its labels.
+    """
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        """
+        Add amount to the counter for the given label values.
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def get(self, labels=()):
+        """
+        Returns the counter's value for the given label values.
+        """
+        return self._values.get(labels, 0)
+
+    def collect(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# TYPE {self.name} counter", f"# HELP {self.name} {self.help}"]
+        lines += [f"{self.name}_total{_labels(self.labelnames, labels)} {_number(value)}" for labels, value in values]
+        return lines
+
+
+class Histogram:
+    """
+    A metric counting observations into cumulative buckets, kept per combination of label values.
+
+    Attributes:
+        name (str): The metric name.
+        help (str): What the metric measures.
+        labelnames (tuple): The names of its labels.
+        buckets (tuple): The upper bounds of the buckets, in increasing order.
+        unit (str): The unit of the observations, e.g. "seconds".
+    """
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS, unit=None):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) + (math.inf,)
+        self.unit = unit
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, labels=()):
+        """
+        Record one observation for the given label values.
+        """
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * len(self.buckets), 0, 0.0]
+            counts = entry[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            entry[1] += 1
+            entry[2] += value
+
+    def get(self, labels=()):
+        """
+        Returns the (count, sum) of the observations for the given label values.
+        """
+        entry = self._values.get(labels)
+        return (entry[1], entry[2]) if entry is not None else (0, 0.0)
+
+    def collect(self):
+        with self._lock:
+            values = sorted((labels, (list(entry[0]), entry[1], entry[2])) for labels, entry in self._values.items())
+        lines = [f"# TYPE {self.name} histogram"]
+        if self.unit:
+            lines.append(f"# UNIT {self.name} {self.unit}")
+        lines.append(f"# HELP {self.name} {self.help}")
+        for labels, (counts, count, total) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = 'le="%s"' % _number(float(bound))
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+        return lines
+
+
+class Registry:
+    """
+    The nokey client metrics, collected from the request and throttle hooks.
+
+    Attributes:
+        request_duration: Histogram of total request seconds, including retries, per client and method.
+        request_ttfb: Histogram of seconds to the first byte of the response, per client and method.
+        requests: Counter of requests per client, method and status code.
+        errors: Counter of failed requests per client, method and error kind (e.g. "http_5xx" or "Timeout").
+        retries: Counter of retried attempts per client and method.
+        bytes_sent: Counter of request body bytes per client and method.
+        bytes_received: Counter of response body bytes received over the network per client and method.
+        bytes_decoded: Counter of response body bytes after decompression per client and method.
+        cache_lookups: Counter of requests per client and result, "hit" when the response came from a cache.
+        throttle_wait: Histogram of seconds spent waiting for each client's rate limit.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.request_duration = Histogram("nokey_request_duration_seconds", "Time spent on a request, including retries.", ("client", "method"), buckets, "seconds")
+        self.request_ttfb = Histogram("nokey_request_ttfb_seconds", "Time from sending a request to receiving the response headers.", ("client", "method"), buckets, "seconds")
+        self.requests = Counter("nokey_requests", "Requests made.", ("client", "method", "status"))
+        self.errors = Counter("nokey_request_errors", "Requests that failed, by kind of error.", ("client", "method", "kind"))
+        self.retries = Counter("nokey_request_retries", "Attempts that were retries.", ("client", "method"))
+        self.bytes_sent = Counter("nokey_request_sent_bytes", "Request body bytes sent.", ("client", "method"))
+        self.bytes_received = Counter("nokey_response_received_bytes", "Response body bytes received over the network.", ("client", "method"))
+        self.bytes_decoded = Counter("nokey_response_decoded_bytes", "Response body bytes after decompression.", ("client", "method"))
+        self.cache_lookups = Counter("nokey_cache_lookups", "Requests answered from a cache (hit) or upstream (miss).", ("client", "result"))
+        self.throttle_wait = Histogram("nokey_throttle_wait_seconds", "Time spent waiting for a client's rate limit.", ("client",), (0.0,) + tuple(buckets), "seconds")
+        self._metrics = [self.request_duration, self.request_ttfb, self.requests, self.errors, self.retries,
+                         self.bytes_sent, self.bytes_received, self.bytes_decoded, self.cache_lookups, self.throttle_wait]
+
+    def observe_request(self, event):
+        """
+        Record a RequestEvent from the request hooks.
+        """
+        labels = (event.client or "", event.method_name or "")
+        self.request_duration.observe(event.total, labels)
+        if event.timings.ttfb is not None:
+            self.request_ttfb.observe(event.timings.ttfb, labels)
+        self.requests.inc(labels + (str(event.status_code or ""),))
+        kind = _error_kind(event)
+        if kind is not None:
+            self.errors.inc(labels + (kind,))
+        if event.retries:
+            self.retries.inc(labels, event.retries)
+        if event.bytes_sent:
+            self.bytes_sent.inc(labels, event.bytes_sent)
+        if event.bytes_received:
+            self.bytes_received.inc(labels, event.bytes_received)
+        if event.bytes_decoded:
+            self.bytes_decoded.inc(labels, event.bytes_decoded)
+        self.cache_lookups.inc((labels[0], "hit" if event.cache_hit else "miss"))
+
+    def observe_throttle(self, event):
+        """
+        Record a ThrottleEvent from the throttle hooks.
+        """
+        self.throttle_wait.observe(event.wait, (event.client or "",))
+
+    def cache_hit_ratio(self, client=""):
+        """
+        Returns the share of a client's requests answered from a cache, or None if it has made none.
+
+        Args:
+            client (str): The name of the API class. "" for requests made directly with the request helpers.
+
+        Returns:
+            float: The hit ratio, between 0 and 1.
+        """
+        hits = self.cache_lookups.get((client, "hit"))
+        total = hits + self.cache_lookups.get((client, "miss"))
+        return hits / total if total else None
+
+    def render(self):
+        """
+        Returns every metric in the OpenMetrics text format, served with CONTENT_TYPE.
+
+        The cache hit ratio of each client is included as the nokey_cache_hit_ratio gauge, and the calls each
+        rate-limited class could make right now without waiting as the nokey_throttle_tokens gauge.
+
+        Returns:
+            str: The exposition, ending with "# EOF".
+        """
+        lines = []
+        for metric in self._metrics:
+            lines += metric.collect()
+        clients = sorted({labels[0] for labels in list(self.cache_lookups._values)})
+        lines += ["# TYPE nokey_cache_hit_ratio gauge", "# HELP nokey_cache_hit_ratio Share of requests answered from a cache."]
+        lines += [f'nokey_cache_hit_ratio{{client="{_escape(client)}"}} {_number(self.cache_hit_ratio(client))}' for client in clients]
+        lines += ["# TYPE nokey_throttle_tokens gauge", "# HELP nokey_throttle_tokens Calls a rate-limited client could make right now without waiting."]
+        lines += [f'nokey_throttle_tokens{{client="{_escape(limiter.name)}"}} {_number(limiter.tokens())}' for limiter in throttler._class_throttlers]
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _error_kind(event):
+    if event.error is not None:
+        return type(event.error).__name__
+    if event.status_code is not None and event.status_code >= 400:
+        return f"http_{event.status_code // 100}xx"
+    return None
+
+
+registry = Registry()
+_enabled = None
+
+
+def enable(target=None):
+    """
+    Start collecting metrics from every API class into a registry.
+
+    Args:
+        target (Registry, optional): The registry to collect into. Defaults to the module's registry.
+
+    Returns:
+        Registry: The registry being collected into.
+    """
+    global _enabled
+    disable()
+    target = target if target is not None else registry
+    hooks.subscribe(target.observe_request)
+    hooks.subscribe_throttle(target.observe_throttle)
+    _enabled = target
+    return target
+
+
+def disable():
+    """
+    Stop collecting metrics. The values collected so far are kept.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    global _enabled
+    if _enabled is not None:
+        hooks.unsubscribe(_enabled.observe_request)
+        hooks.unsubscribe_throttle(_enabled.observe_throttle)
+        _enabled = None
+
+
+def render(target=None):
+    """
+    Returns the metrics of a registry in the OpenMetrics text format.
+
+    Args:
+        target (Registry, optional): The registry to render. Defaults to the module's registry.
+
+    Returns:
+        str: The exposition.
+    """
+    return (target if target is not None else registry).render()
+
+
+def start_http_server(port, addr="127.0.0.1", target=None):
+    """
+    Serve the metrics for scraping at http://addr:port/metrics, from a background thread.
+
+    Args:
+        port (int): The port to listen on. 0 picks a free one.
+        addr (str): The address to listen on. Default is localhost only.
+        target (Registry, optional): The registry to serve. Defaults to the module's registry.
+
+    Returns:
+        ThreadingHTTPServer: The running server. Call its shutdown method to stop it.
+    """
+    source = target if target is not None else registry
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = source.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((addr, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,128 @@
+import email.utils
+import random
+import time
+from requests.exceptions import ConnectionError, Timeout
+
+DEFAULT_TIMEOUT = (5, 30)
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request is retried and how long to wait before the next attempt.
+
+    Waits grow exponentially with full jitter. A Retry-After header from the server is used instead
+    when present. No retry is made if it would push the total time spent past max_elapsed.
+
+    Attributes:
+        total (int): The maximum number of retries after the first attempt.
+        backoff_factor (float): The base wait in seconds. The nth retry waits up to backoff_factor * 2 ** (n - 1).
+        max_backoff (float): The longest single wait, in seconds, when the server gives no Retry-After.
+        max_elapsed (float): The most time, in seconds, to spend on a request including all retries and waits.
+        status_forcelist (tuple): The HTTP status codes that are retried.
+        methods (tuple): The HTTP methods that are safe to retry.
+    """
+
+    def __init__(self, total=3, backoff_factor=0.5, max_backoff=30, max_elapsed=60,
+                 status_forcelist=(429, 500, 502, 503, 504), methods=("GET", "HEAD", "OPTIONS", "PUT", "DELETE")):
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_elapsed = max_elapsed
+        self.status_forcelist = frozenset(status_forcelist)
+        self.methods = frozenset(method.upper() for method in methods)
+
+    def next_delay(self, method, attempt, response=None, error=None, elapsed=0.0):
+        """
+        Returns how long to wait before retrying, or None if the request should not be retried.
+
+        Args:
+            method (str): The HTTP method of the request.
+            attempt (int): The number of attempts made so far.
+            response (requests.Response, optional): The response of the last attempt.
+            error (Exception, optional): The exception raised by the last attempt.
+            elapsed (float): Seconds spent on the request so far.
+
+        Returns:
+            float: Seconds to wait, or None.
+        """
+        if attempt > self.total or method.upper() not in self.methods:
+            return None
+        if error is not None:
+            if not isinstance(error, (ConnectionError, Timeout)):
+                return None
+            delay = None
+        elif response is not None and response.status_code in self.status_forcelist:
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+        else:
+            return None
+        if delay is None:
+            delay = random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1)))
+        if elapsed + delay > self.max_elapsed:
+            return None
+        return delay
+
+
+NO_RETRY = RetryPolicy(total=0)
+DEFAULT_RETRY = RetryPolicy()
+
+
+def parse_retry_after(value):
+    """
+    Returns the number of seconds a Retry-After header asks to wait, or None if it is missing or malformed.
+
+    Args:
+        value (str): The header value, either a number of seconds or an HTTP date.
+
+    Returns:
+        float: Seconds to wait, or None.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RequestInfo:
+    """
+    What happened while sending one request.
+
+    Attributes:
+        method (str): The HTTP method.
+        url (str): The URL of the request.
+        attempts (int): How many times the request was sent.
+        retries (int): How many of those attempts were retries.
+        backoff_time (float): Total seconds spent waiting between attempts.
+        elapsed (float): Total seconds spent on the request, including waits.
+        status_code (int): The status code of the final response, or None if no response was received.
+        content_encoding (str): The Content-Encoding of the final response, e.g. "gzip" or "br", or None if it was not compressed.
+        bytes_received (int): Bytes of the body that came over the network, or None if unknown (e.g. for streamed bodies).
+        bytes_decoded (int): Bytes of the body after decompression, or None if unknown.
+        timings (Timings): DNS, connect, TLS and time-to-first-byte timings. Only measured while a request hook is subscribed, None otherwise.
+    """
+    __slots__ = ("method", "url", "attempts", "retries", "backoff_time", "elapsed", "status_code", "content_encoding", "bytes_received", "bytes_decoded", "timings")
+
+    def __init__(self, method, url):
+        self.method = method
+        self.url = url
+        self.attempts = 0
+        self.retries = 0
+        self.backoff_time = 0.0
+        self.elapsed = 0.0
+        self.status_code = None
+        self.content_encoding = None
+        self.bytes_received = None
+        self.bytes_decoded = None
+        self.timings = None
+
+    def __repr__(self):
+        return (f"RequestInfo(method={self.method!r}, url={self.url!r}, attempts={self.attempts}, retries={self.retries}, "
+                f"backoff_time={self.backoff_time:.3f}, elapsed={self.elapsed:.3f}, status_code={self.status_code}, "
+                f"content_encoding={self.content_encoding!r}, bytes_received={self.bytes_received}, bytes_decoded={self.bytes_decoded})")
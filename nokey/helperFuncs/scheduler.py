@@ -0,0 +1,231 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+
+INTERACTIVE = 0
+NORMAL = 1
+BULK = 2
+
+
+class Schedule:
+    """
+    How a request waits for its API class's rate limit.
+
+    Attributes:
+        priority (int): INTERACTIVE, NORMAL or BULK. Lower numbers are served first.
+        caller: Who the request is made for. Requests of the same priority from different callers take turns.
+        deadline (float): The time.monotonic() time after which the request is dropped rather than sent, or None.
+    """
+    __slots__ = ("priority", "caller", "deadline")
+
+    def __init__(self, priority=NORMAL, caller=None, deadline=None):
+        self.priority = priority
+        self.caller = caller
+        self.deadline = deadline
+
+    def remaining(self):
+        """
+        Returns the seconds left until the deadline, or None if there is none.
+        """
+        return None if self.deadline is None else self.deadline - time.monotonic()
+
+
+_DEFAULT = Schedule()
+
+
+class _Ticket:
+    # A request in a Scheduler's queue. state is None while it waits, True once it has the turn, False if it was dropped.
+    __slots__ = ("schedule", "loop", "waiter", "state")
+
+    def __init__(self, schedule, loop=None):
+        self.schedule = schedule
+        self.loop = loop
+        self.waiter = None
+        self.state = None
+
+    def wake(self, state):
+        self.state = state
+        if self.loop is None:
+            self.waiter.set()
+            return True
+        try:
+            self.loop.call_soon_threadsafe(_resolve, self.waiter)
+        except RuntimeError:
+            # The event loop of the waiting task has closed, so nobody is left to take the turn.
+            return False
+        return True
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class Scheduler:
+    """
+    Decides which of the requests waiting for an API class's rate limit gets the next slot.
+
+    Slots go to the waiting request with the highest priority, so INTERACTIVE requests overtake NORMAL ones and
+    BULK requests use the capacity left over. Within a priority, callers take turns, one request each, so a caller
+    with many requests queued does not hold up the others. A request whose deadline passes while it waits, or
+    whose slot would only come up after its deadline, is dropped without taking a slot.
+
+    One request at a time holds the turn: it waits for its slot from the throttler and then hands the turn on.
+    A request that finds nobody else waiting goes straight to the throttler. The time a request spends queued counts
+    towards its wait in the throttler's stats and throttle hooks.
+
+    Attributes:
+        throttler (Throttler): The rate limiter the slots come from.
+        dropped (int): How many requests were dropped because of their deadline.
+    """
+
+    def __init__(self, throttler):
+        self.throttler = throttler
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._busy = False
+        # priority -> OrderedDict of caller -> deque of tickets; the first caller is the next to be served.
+        self._queues = {}
+
+    def waiting(self):
+        """
+        Returns how many requests are queued behind the one holding the turn.
+        """
+        with self._lock:
+            return sum(len(tickets) for callers in self._queues.values() for tickets in callers.values())
+
+    def acquire(self, cost=1, schedule=None):
+        """
+        Wait for the request's turn and then for its slot, and take the slot.
+
+        Args:
+            cost (int): How many calls' worth of the limit to take. Default is 1.
+            schedule (Schedule, optional): The request's priority, caller and deadline. Defaults to NORMAL with no deadline.
+
+        Returns:
+            bool: True once the slot is taken, or False if the request was dropped because of its deadline, taking nothing.
+        """
+        schedule = schedule or _DEFAULT
+        ticket = _Ticket(schedule)
+        queued = 0.0
+        if not self._enter(ticket):
+            started = time.monotonic()
+            try:
+                ticket.waiter.wait(_positive(schedule.remaining()))
+            except BaseException:
+                self._settle(ticket, abandon=True)
+                raise
+            self._settle(ticket)
+            if not ticket.state:
+                return self._drop()
+            queued = time.monotonic() - started
+        try:
+            timeout = schedule.remaining()
+            wait = self.throttler._take(timeout, cost) if timeout is None or timeout > 0 else None
+        finally:
+            self._leave()
+        if wait is None:
+            return self._drop()
+        self.throttler._record(queued + wait)
+        return True
+
+    async def acquire_async(self, cost=1, schedule=None):
+        """
+        The asyncio version of acquire: waits by awaiting, in the same queue as the synchronous callers.
+
+        Args:
+            cost (int): How many calls' worth of the limit to take. Default is 1.
+            schedule (Schedule, optional): The request's priority, caller and deadline. Defaults to NORMAL with no deadline.
+
+        Returns:
+            bool: True once the slot is taken, or False if the request was dropped because of its deadline, taking nothing.
+        """
+        schedule = schedule or _DEFAULT
+        ticket = _Ticket(schedule, asyncio.get_running_loop())
+        queued = 0.0
+        if not self._enter(ticket):
+            started = time.monotonic()
+            try:
+                await asyncio.wait((ticket.waiter,), timeout=_positive(schedule.remaining()))
+            except BaseException:
+                self._settle(ticket, abandon=True)
+                raise
+            self._settle(ticket)
+            if not ticket.state:
+                return self._drop()
+            queued = time.monotonic() - started
+        try:
+            timeout = schedule.remaining()
+            wait = await self.throttler._take_async(timeout, cost) if timeout is None or timeout > 0 else None
+        finally:
+            self._leave()
+        if wait is None:
+            return self._drop()
+        self.throttler._record(queued + wait)
+        return True
+
+    def _enter(self, ticket):
+        # Returns True if the ticket takes the turn straight away, otherwise queues it.
+        with self._lock:
+            if not self._busy:
+                self._busy = True
+                return True
+            ticket.waiter = ticket.loop.create_future() if ticket.loop is not None else threading.Event()
+            callers = self._queues.setdefault(ticket.schedule.priority, OrderedDict())
+            callers.setdefault(ticket.schedule.caller, deque()).append(ticket)
+            return False
+
+    def _settle(self, ticket, abandon=False):
+        # After a wait: leave the queue if still in it, or pass on a turn that came too late or is abandoned.
+        with self._lock:
+            if ticket.state is None:
+                callers = self._queues[ticket.schedule.priority]
+                tickets = callers[ticket.schedule.caller]
+                tickets.remove(ticket)
+                if not tickets:
+                    del callers[ticket.schedule.caller]
+                    if not callers:
+                        del self._queues[ticket.schedule.priority]
+                ticket.state = False
+                return
+        if ticket.state and (abandon or (ticket.schedule.deadline is not None and time.monotonic() >= ticket.schedule.deadline)):
+            ticket.state = False
+            self._leave()
+
+    def _leave(self):
+        # Hand the turn to the next request, dropping the ones whose deadline has passed.
+        now = time.monotonic()
+        with self._lock:
+            while True:
+                ticket = self._next()
+                if ticket is None:
+                    self._busy = False
+                    return
+                if ticket.schedule.deadline is not None and ticket.schedule.deadline <= now:
+                    ticket.wake(False)
+                elif ticket.wake(True):
+                    return
+
+    def _next(self):
+        for priority in sorted(self._queues):
+            callers = self._queues[priority]
+            caller, tickets = next(iter(callers.items()))
+            ticket = tickets.popleft()
+            # The caller goes to the back of the rotation, or out of it if it has nothing else queued.
+            del callers[caller]
+            if tickets:
+                callers[caller] = tickets
+            elif not callers:
+                del self._queues[priority]
+            return ticket
+        return None
+
+    def _drop(self):
+        with self._lock:
+            self.dropped += 1
+        return False
+
+
+def _positive(timeout):
+    return None if timeout is None else max(timeout, 0.0)
@@ -0,0 +1,237 @@
+import threading
+import time
+import weakref
+import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import parse_url
+from . compression import accept_encoding
+from . hooks import record_connection
+
+DEFAULT_POOL_CONNECTIONS = 32
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_IDLE_TIMEOUT = 60
+
+_default_ports = {"http": 80, "https": 443}
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        started = time.perf_counter()
+        sock = super()._new_conn()
+        record_connection(connect=time.perf_counter() - started)
+        return sock
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def _new_conn(self):
+        started = time.perf_counter()
+        sock = super()._new_conn()
+        self._nokey_connected = time.perf_counter()
+        record_connection(connect=self._nokey_connected - started)
+        return sock
+
+    def connect(self):
+        self._nokey_connected = None
+        super().connect()
+        if self._nokey_connected is not None:
+            record_connection(tls=time.perf_counter() - self._nokey_connected)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+    An HTTPAdapter whose new connections report their connect and TLS handshake times to the request hooks.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool, "https": _TimedHTTPSConnectionPool}
+
+
+def mount_pooled_adapters(session, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE):
+    """
+    Mounts keep-alive connection pools on a session for both http and https.
+
+    Args:
+        session (requests.Session): The session to configure.
+        pool_connections (int): The number of hosts to keep a connection pool for.
+        pool_maxsize (int): The maximum number of connections kept open per host.
+
+    Returns:
+        requests.Session: The same session, for chaining.
+    """
+    adapter = TimedHTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class PooledSessionMixin:
+    """
+    Session mixin that reuses connections per host and drops pools that have sat idle too long.
+    It asks for the best compression that can be decoded, see compression.accept_encoding.
+
+    Attributes:
+        pool_connections (int): The number of hosts to keep a connection pool for.
+        pool_maxsize (int): The maximum number of connections kept open per host.
+        idle_timeout (float): Seconds a host may go unused before its pooled connections are closed.
+    """
+
+    def __init__(self, *args, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE, idle_timeout=DEFAULT_IDLE_TIMEOUT, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.idle_timeout = idle_timeout
+        self._last_used = {}
+        self._idle_lock = threading.Lock()
+        mount_pooled_adapters(self, pool_connections, pool_maxsize)
+        self.headers["Accept-Encoding"] = accept_encoding()
+
+    def request(self, method, url, *args, **kwargs):
+        """
+        Send a request, first closing this host's pooled connections if they have gone stale.
+        """
+        self._prune_idle(url)
+        return super().request(method, url, *args, **kwargs)
+
+    def _prune_idle(self, url):
+        if self.idle_timeout is None:
+            return
+        parsed = parse_url(url)
+        if parsed.host is None:
+            return
+        scheme = (parsed.scheme or "http").lower()
+        host_key = (scheme, parsed.host.lower(), parsed.port or _default_ports.get(scheme, 80))
+        now = time.monotonic()
+        with self._idle_lock:
+            last_used = self._last_used.get(host_key)
+            self._last_used[host_key] = now
+            if last_used is None or now - last_used <= self.idle_timeout:
+                return
+            for adapter in self.adapters.values():
+                pools = adapter.poolmanager.pools
+                for pool_key in pools.keys():
+                    if (pool_key.key_scheme, pool_key.key_host, pool_key.key_port) == host_key:
+                        del pools[pool_key]
+
+
+class PooledSession(PooledSessionMixin, requests.Session):
+    """
+    A requests Session with per-host keep-alive pools and idle pruning.
+    """
+
+
+class PooledCachedSession(PooledSessionMixin, requests_cache.CachedSession):
+    """
+    A requests_cache CachedSession with per-host keep-alive pools and idle pruning.
+    """
+
+
+_pooled_classes = {requests.Session: PooledSession}
+_cached_sessions = weakref.WeakValueDictionary()
+_cached_lock = threading.Lock()
+
+
+def _pooled_class(session_cls):
+    # requests_cache.install_cache swaps requests.Session for a caching subclass, so the
+    # shared session is built on whatever requests.Session currently is.
+    if session_cls not in _pooled_classes:
+        _pooled_classes[session_cls] = type("PooledSession", (PooledSessionMixin, session_cls), {})
+    return _pooled_classes[session_cls]
+
+
+_default_session = None
+_default_base = None
+_default_lock = threading.Lock()
+_default_options = {
+    "pool_connections": DEFAULT_POOL_CONNECTIONS,
+    "pool_maxsize": DEFAULT_POOL_MAXSIZE,
+    "idle_timeout": DEFAULT_IDLE_TIMEOUT,
+}
+
+
+def get_session():
+    """
+    Returns the process-wide pooled session shared by every API class that was not given its own.
+
+    Args:
+        None
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _default_session, _default_base
+    session_cls = requests.Session
+    if _default_session is None or _default_base is not session_cls:
+        with _default_lock:
+            if _default_session is None or _default_base is not session_cls:
+                _default_session = _pooled_class(session_cls)(**_default_options)
+                _default_base = session_cls
+    return _default_session
+
+
+def cached_session(cache_name, backend="sqlite", expire_after=3600, **kwargs):
+    """
+    Returns a pooled session that caches responses in its own requests_cache cache, for an API class created with use_caching=True.
+
+    Unlike requests_cache.install_cache, this leaves requests and every other client alone, so each API class can
+    have its own backend and expiry. Clients asking for the same cache name, backend and expiry share one session.
+    To share a cache between clients with different settings, create one session and pass it to each as session=.
+
+    Args:
+        cache_name (str): The cache name: the database file for sqlite, the directory for filesystem, and so on.
+        backend (str or requests_cache.BaseCache): The cache backend, e.g. "sqlite", "memory", "redis" or "filesystem".
+        expire_after (int or datetime.timedelta): Seconds to keep responses for. -1 keeps them forever.
+        **kwargs: Other CachedSession or pool settings, such as pool_maxsize. A session made with them is never shared.
+
+    Returns:
+        PooledCachedSession: The session.
+    """
+    if kwargs:
+        return PooledCachedSession(cache_name, backend=backend, expire_after=expire_after, **kwargs)
+    try:
+        key = (cache_name, backend, expire_after)
+        hash(key)
+    except TypeError:
+        return PooledCachedSession(cache_name, backend=backend, expire_after=expire_after)
+    with _cached_lock:
+        session = _cached_sessions.get(key)
+        if session is None:
+            session = _cached_sessions[key] = PooledCachedSession(cache_name, backend=backend, expire_after=expire_after)
+    return session
+
+
+def configure_session(pool_connections=None, pool_maxsize=None, idle_timeout=None):
+    """
+    Changes the pool settings of the shared session. The current shared session is closed and
+    a new one is created with the new settings on next use.
+
+    Args:
+        pool_connections (int, optional): The number of hosts to keep a connection pool for.
+        pool_maxsize (int, optional): The maximum number of connections kept open per host.
+        idle_timeout (float, optional): Seconds a host may go unused before its connections are closed. None keeps the current value.
+
+    Returns:
+        None
+    """
+    global _default_session
+    with _default_lock:
+        if pool_connections is not None:
+            _default_options["pool_connections"] = pool_connections
+        if pool_maxsize is not None:
+            _default_options["pool_maxsize"] = pool_maxsize
+        if idle_timeout is not None:
+            _default_options["idle_timeout"] = idle_timeout
+        old_session, _default_session = _default_session, None
+    if old_session is not None:
+        old_session.close()
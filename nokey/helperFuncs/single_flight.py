@@ -0,0 +1,133 @@
+import asyncio
+import json
+import threading
+import weakref
+
+
+def request_key(method, url, session=None, **kwargs):
+    """
+    Returns a hashable key identifying a request by its method, URL, params, headers and body.
+
+    Args:
+        method (str): The HTTP method.
+        url (str): The URL of the request.
+        session (optional): The session the request is sent with. Requests on different sessions never share a key.
+        **kwargs: The params, headers, data and json of the request.
+
+    Returns:
+        tuple: The key.
+    """
+    parts = [method.upper(), url, id(session)]
+    for name in ("params", "headers", "data", "json"):
+        value = kwargs.get(name)
+        parts.append(None if value is None else json.dumps(value, sort_keys=True, default=str))
+    return tuple(parts)
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Lets threads making the same call at the same time share one execution of it.
+
+    The first thread to ask for a key runs the function. Threads asking for the same key while it runs
+    wait for it and get its result, or its exception, instead of running the function themselves.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        """
+        Run func, unless a call with the same key is already running, in which case wait for its result.
+
+        Args:
+            key: A hashable key identifying the call.
+            func: The function to run, without arguments.
+
+        Returns:
+            The return value of func, from this thread's call or the one it joined.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+
+class AsyncSingleFlight:
+    """
+    The asyncio counterpart of SingleFlight: tasks awaiting the same key at the same time share one execution.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, func):
+        """
+        Await func(), unless a call with the same key is already running, in which case await its result.
+
+        Args:
+            key: A hashable key identifying the call.
+            func: A function without arguments returning an awaitable.
+
+        Returns:
+            The result of the awaitable, from this task's call or the one it joined.
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as err:
+            future.set_exception(err)
+            # Retrieve the exception so it is not reported as unhandled when nobody joined the call.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+
+_async_flights = weakref.WeakKeyDictionary()
+
+
+def async_single_flight():
+    """
+    Returns the AsyncSingleFlight of the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    flight = _async_flights.get(loop)
+    if flight is None:
+        flight = _async_flights[loop] = AsyncSingleFlight()
+    return flight
@@ -0,0 +1,131 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(tempfile.gettempdir(), "nokey_throttle.sqlite3")
+
+
+class LocalState:
+    """
+    Throttler state kept in this process, shared by its threads.
+
+    The state is a single theoretical arrival time (TAT): when the limiter is back to a full burst.
+    """
+
+    def __init__(self):
+        self._tat = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, increment, tolerance, max_wait):
+        """
+        Reserve the next slot and return how long to wait for it.
+
+        Args:
+            increment (float): Seconds of the budget the call uses (its cost times the interval between calls).
+            tolerance (float): Seconds of budget that may be used ahead of time (the burst times the interval).
+            max_wait (float): The longest acceptable wait in seconds, or None for no limit.
+
+        Returns:
+            float: Seconds to wait before the call, or None, reserving nothing, if that would exceed max_wait.
+        """
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now) + increment
+            wait = tat - tolerance - now
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tat = tat
+        return max(wait, 0.0)
+
+    def hold(self, offset):
+        """
+        Make sure the limiter's TAT is at least offset seconds from now, so no slot is given out before then.
+        """
+        with self._lock:
+            self._tat = max(self._tat, time.monotonic() + offset)
+
+    def backlog(self):
+        """
+        Returns how many seconds of budget are reserved ahead of now. 0.0 when the limiter is idle.
+        """
+        return max(self._tat - time.monotonic(), 0.0)
+
+
+class SQLiteState:
+    """
+    Throttler state kept in a SQLite database file, shared by every process on the host that uses the same file and key.
+
+    Each reservation is one short write transaction, so processes take turns at the state without
+    holding a lock while they wait for their slot. Times are wall-clock times, as the processes share no other clock.
+
+    Attributes:
+        key (str): The budget to draw from, usually the name of the API class.
+        path (str): The database file.
+        timeout (float): Seconds to wait for another process's transaction before giving up.
+    """
+
+    def __init__(self, key, path=None, timeout=10.0):
+        self.key = key
+        self.path = path or DEFAULT_PATH
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        # sqlite3 connections belong to one thread, and must not be carried over into a forked worker.
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("CREATE TABLE IF NOT EXISTS throttle (key TEXT PRIMARY KEY, tat REAL NOT NULL)")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def reserve(self, increment, tolerance, max_wait):
+        """
+        Reserve the next slot and return how long to wait for it. See LocalState.reserve.
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = conn.execute("SELECT tat FROM throttle WHERE key = ?", (self.key,)).fetchone()
+            tat = max(row[0] if row is not None else 0.0, now) + increment
+            wait = tat - tolerance - now
+            if max_wait is not None and wait > max_wait:
+                conn.execute("ROLLBACK")
+                return None
+            conn.execute("INSERT OR REPLACE INTO throttle (key, tat) VALUES (?, ?)", (self.key, tat))
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        return max(wait, 0.0)
+
+    def hold(self, offset):
+        """
+        Make sure the limiter's TAT is at least offset seconds from now. See LocalState.hold.
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            tat = time.time() + offset
+            row = conn.execute("SELECT tat FROM throttle WHERE key = ?", (self.key,)).fetchone()
+            if row is None or row[0] < tat:
+                conn.execute("INSERT OR REPLACE INTO throttle (key, tat) VALUES (?, ?)", (self.key, tat))
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    def backlog(self):
+        """
+        Returns how many seconds of budget are reserved ahead of now. 0.0 when the limiter is idle.
+        """
+        row = self._connection().execute("SELECT tat FROM throttle WHERE key = ?", (self.key,)).fetchone()
+        return max(row[0] - time.time(), 0.0) if row is not None else 0.0
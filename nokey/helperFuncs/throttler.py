@@ -1,96 +1,414 @@
+import asyncio
+import math
+import os
+import threading
 import time
-from functools import wraps
+from collections import deque
+from . throttle_state import LocalState, SQLiteState, DEFAULT_PATH
+from . scheduler import Scheduler
+from . retry import parse_retry_after
+from . base_client import BaseClient
+from . import hooks
+
+MAX_BACKOFF = 32.0
+RECOVERY = 0.9
+# How many of the latest waits the percentiles of ThrottleStats are taken over.
+RECENT_WAITS = 1024
+
+_class_throttlers = []
+_shared_path = os.environ.get("NOKEY_THROTTLE_DB") or None
 
 class Throttler:
     """
-    A class to enforce rate limiting on function calls.
+    A thread-safe rate limiter for function calls, using the generic cell rate algorithm (a token bucket).
+
+    Calls are paced evenly instead of being let through in bursts at the start of each period, and no window
+    of period seconds ever sees more than rate_limit calls. Up to burst calls may go through back to back;
+    the rest are spaced out so the limit still holds. Each call reserves its slot under a lock and then waits
+    without holding it, so threads sharing the throttler are each given their own slot. Coroutines wait with
+    acquire_async, which takes its slots from the same budget. With a SQLiteState, processes share it too.
 
     Attributes:
         rate_limit (int): The maximum number of allowed calls within the period.
         period (int): The time period in seconds during which the rate limit applies.
-        last_call (float): The time of the last function call.
-        num_calls (int): The number of calls made within the current period.
+        burst (int): How many calls may go through back to back. Default is 1, which spaces every call evenly.
+            As the burst counts towards the limit, a larger burst lowers the pace of the calls after it.
+        interval (float): Seconds between calls once the burst is used up.
+        state: Where the limiter's state is kept: a LocalState for this process, or a SQLiteState shared between processes.
+        scheduler (Scheduler): Orders the requests of the API class waiting for the limiter by priority, caller and deadline.
+        adaptive (bool): Whether the limiter follows the limits reported by the upstream, see observe. Default is True.
+        verbose (bool): Whether to print a line each time a call has to wait. Default is False; see stats for the figures instead.
     """
     
-    def __init__(self, rate_limit: int, period: int):
+    def __init__(self, rate_limit: int, period: int, burst: int = 1, state=None):
         """
         Initialize the Throttler with a rate limit and a period.
 
         Args:
             rate_limit (int): The maximum number of allowed calls within the period.
             period (int): The time period in seconds during which the rate limit applies.
+            burst (int): How many calls may go through back to back, at most rate_limit. Default is 1.
+            state (optional): Where to keep the limiter's state. Defaults to a new LocalState.
         """
+        if rate_limit < 1 or period <= 0:
+            raise ValueError("rate_limit must be at least 1 and period must be positive")
         self.rate_limit = rate_limit
         self.period = period
-        self.last_call = 0
-        self.num_calls = 0
+        self.burst = max(1, min(burst, rate_limit))
+        self.name = None
+        self.state = state if state is not None else LocalState()
+        self.adaptive = True
+        # How much slower than the configured rate calls are paced after 429 responses.
+        self.backoff = 1.0
+        # The pace the upstream's rate limit headers allow, and until when they apply.
+        self._upstream_interval = None
+        self._upstream_until = 0.0
+        self._adapt_lock = threading.Lock()
+        self.scheduler = Scheduler(self)
+        self.verbose = False
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    @property
+    def interval(self):
+        if self._upstream_interval is not None and time.monotonic() < self._upstream_until:
+            interval = self._upstream_interval
+        else:
+            # The burst counts towards the limit, so later calls are spaced to keep any period at rate_limit calls.
+            interval = self.period / (self.rate_limit - self.burst + 1)
+        return interval * self.backoff
+
+    def observe(self, status_code, headers):
+        """
+        Adapt the pace of calls to a response from the upstream. The request helpers call this for every response
+        to a rate-limited API class.
+
+        A 429 Too Many Requests halves the pace, down to 1/32 of the configured rate, and each other response
+        brings it back up by 10%. Retry-After on a 429 or 503 holds every call until it has passed. Rate limit
+        headers (X-RateLimit-Remaining/Reset, RateLimit-Remaining/Reset, or IP-API's X-Rl/X-Ttl) set the pace to
+        the remaining calls spread over the time until the reset, which may be faster or slower than the configured
+        rate, and hold every call until the reset once no calls remain.
+
+        Args:
+            status_code (int): The status code of the response.
+            headers (dict): The headers of the response.
+
+        Returns:
+            None
+        """
+        if not self.adaptive:
+            return
+        remaining, reset = _rate_limit_headers(headers)
+        hold = 0.0
+        with self._adapt_lock:
+            if status_code == 429:
+                self.backoff = min(self.backoff * 2, MAX_BACKOFF)
+            elif self.backoff > 1.0:
+                self.backoff = max(self.backoff * RECOVERY, 1.0)
+            if remaining is not None and reset is not None:
+                if remaining > 0:
+                    self._upstream_interval = reset / remaining
+                    self._upstream_until = time.monotonic() + reset
+                else:
+                    hold = reset
+        if status_code in (429, 503):
+            hold = max(hold, parse_retry_after(headers.get("Retry-After")) or 0.0)
+        if hold > 0:
+            # Leave room for the burst, so the first call after the hold is the one that waits exactly that long.
+            self.state.hold(hold + (self.burst - 1) * self.interval)
+
+    def _reserve(self, cost, max_wait):
+        """
+        Reserve the next slot for a call of the given cost and return how long to wait for it,
+        or None, reserving nothing, if that would be longer than max_wait seconds.
+        """
+        interval = self.interval
+        return self.state.reserve(cost * interval, self.burst * interval, max_wait)
+
+    def try_acquire(self, cost=1):
+        """
+        Take a slot if one is free right now, without waiting.
+
+        Args:
+            cost (int): How many calls' worth of the limit to take. Default is 1.
+
+        Returns:
+            bool: True if the slot was taken, False if the call would have to wait.
+        """
+        if self._reserve(cost, 0.0) is None:
+            return False
+        self._record(0.0)
+        return True
+
+    def acquire(self, timeout=None, cost=1):
+        """
+        Wait for a slot and take it. Calls are given slots in the order they ask for them.
+
+        Args:
+            timeout (float, optional): The longest to wait, in seconds. None waits as long as needed.
+            cost (int): How many calls' worth of the limit to take. Default is 1.
+
+        Returns:
+            bool: True once the slot is taken, or False straight away, taking nothing, if it would not be free within the timeout.
+        """
+        wait = self._take(timeout, cost)
+        if wait is None:
+            return False
+        self._record(wait)
+        return True
+
+    async def acquire_async(self, timeout=None, cost=1):
+        """
+        The asyncio version of acquire: waits for a slot by awaiting, so the event loop keeps running other tasks meanwhile.
+
+        Slots come from the same budget as acquire, so synchronous and asynchronous callers sharing the throttler together stay within the limit.
+
+        Args:
+            timeout (float, optional): The longest to wait, in seconds. None waits as long as needed.
+            cost (int): How many calls' worth of the limit to take. Default is 1.
+
+        Returns:
+            bool: True once the slot is taken, or False straight away, taking nothing, if it would not be free within the timeout.
+        """
+        wait = await self._take_async(timeout, cost)
+        if wait is None:
+            return False
+        self._record(wait)
+        return True
+
+    def _take(self, timeout, cost):
+        # Reserve a slot and sleep until it comes up. Returns the wait, or None if the slot is not free within timeout.
+        wait = self._reserve(cost, timeout)
+        if wait:
+            self._report_wait(wait)
+            time.sleep(wait)
+        return wait
+
+    async def _take_async(self, timeout, cost):
+        wait = self._reserve(cost, timeout)
+        if wait:
+            self._report_wait(wait)
+            await asyncio.sleep(wait)
+        return wait
+
+    def _report_wait(self, wait):
+        if self.verbose:
+            print(f"Rate limit reached. Sleeping for {wait:.2f} seconds.")
+
+    def _record(self, wait):
+        # Count a call that passed the limiter after waiting wait seconds, and tell the throttle hooks.
+        with self._stats_lock:
+            self._calls += 1
+            if wait > 0:
+                self._waits += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+            self._recent.append(wait)
+        if hooks._throttle_subscribers:
+            hooks.emit_throttle(self.name, wait)
+
+    def tokens(self):
+        """
+        Returns how many calls could go through right now without waiting: the burst, less what earlier calls have used up.
+        """
+        return max(self.burst - self.state.backlog() / self.interval, 0.0)
+
+    def stats(self):
+        """
+        Returns how much the limiter has slowed calls down since it was created or its stats were last reset.
+
+        Args:
+            None
+
+        Returns:
+            ThrottleStats: A snapshot of the figures.
+        """
+        with self._stats_lock:
+            calls, waits, total_wait, max_wait = self._calls, self._waits, self._total_wait, self._max_wait
+            recent = sorted(self._recent)
+        p99 = recent[math.ceil(0.99 * len(recent)) - 1] if recent else 0.0
+        return ThrottleStats(self.name, calls, waits, total_wait, p99, max_wait, self.scheduler.dropped, self.scheduler.waiting(), self.tokens())
+
+    def reset_stats(self):
+        """
+        Start counting the figures reported by stats from zero.
+        """
+        with self._stats_lock:
+            self._calls = 0
+            self._waits = 0
+            self._total_wait = 0.0
+            self._max_wait = 0.0
+            self._recent = deque(maxlen=RECENT_WAITS)
+        self.scheduler.dropped = 0
 
     def throttle(self):
         """
-        Enforce the rate limit. If the number of calls exceeds the rate limit within the period, this method will make the calling thread sleep until the period resets.
+        Enforce the rate limit, making the calling thread sleep until its slot comes up. Same as acquire().
+        """
+        self.acquire()
+
+    async def throttle_async(self):
         """
-        current_time = time.time()
-        elapsed = current_time - self.last_call
+        Enforce the rate limit without blocking the event loop. Same as acquire_async().
+        """
+        await self.acquire_async()
+
+class ThrottleStats:
+    """
+    How much a Throttler has slowed calls down, as returned by Throttler.stats.
+
+    Attributes:
+        name (str): The name of the API class the throttler belongs to, or None.
+        calls (int): Calls that passed the limiter.
+        waits (int): How many of them had to wait.
+        total_wait (float): Seconds spent waiting, in total, including time queued behind other requests.
+        mean_wait (float): Average seconds waited per call, counting the calls that did not wait.
+        p99_wait (float): The 99th percentile of the seconds waited, over the latest 1024 calls.
+        max_wait (float): The longest wait, in seconds.
+        dropped (int): Requests the scheduler dropped because of their deadline.
+        queued (int): Requests queued for the limiter right now.
+        tokens (float): Calls that could go through right now without waiting.
+    """
+    __slots__ = ("name", "calls", "waits", "total_wait", "p99_wait", "max_wait", "dropped", "queued", "tokens")
 
-        if elapsed >= self.period:
-            self.last_call = current_time
-            self.num_calls = 0
+    def __init__(self, name, calls, waits, total_wait, p99_wait, max_wait, dropped, queued, tokens):
+        self.name = name
+        self.calls = calls
+        self.waits = waits
+        self.total_wait = total_wait
+        self.p99_wait = p99_wait
+        self.max_wait = max_wait
+        self.dropped = dropped
+        self.queued = queued
+        self.tokens = tokens
 
-        if self.num_calls >= self.rate_limit:
-            sleep_time = self.period - elapsed
-            print(f"Rate limit reached. Sleeping for {sleep_time:.2f} seconds.")
-            time.sleep(sleep_time)
-            self.last_call = time.time()
-            self.num_calls = 0
+    @property
+    def mean_wait(self):
+        return self.total_wait / self.calls if self.calls else 0.0
 
-        self.num_calls += 1
+    def __repr__(self):
+        return (f"ThrottleStats(name={self.name!r}, calls={self.calls}, waits={self.waits}, total_wait={self.total_wait:.3f}, "
+                f"p99_wait={self.p99_wait:.3f}, max_wait={self.max_wait:.3f}, dropped={self.dropped}, queued={self.queued}, tokens={self.tokens:.2f})")
 
-def throttle_class(rate_limit: int, period: int):
+
+def throttle_stats():
     """
-    Class decorator to apply throttling to all methods in the class.
+    Returns the ThrottleStats of every rate-limited API class, e.g. throttle_stats()["Artic"].p99_wait.
+
+    Args:
+        None
+
+    Returns:
+        dict: The stats by API class name.
+    """
+    return {throttler.name: throttler.stats() for throttler in _class_throttlers}
+
+
+def _header_number(headers, *names):
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return float(value.split(",")[0])
+            except ValueError:
+                return None
+    return None
+
+
+def _rate_limit_headers(headers):
+    """
+    Returns the (calls remaining, seconds until the reset) reported by a response's rate limit headers, or None for each that is missing.
+    """
+    remaining = _header_number(headers, "X-RateLimit-Remaining", "RateLimit-Remaining", "X-Rl")
+    reset = _header_number(headers, "X-RateLimit-Reset", "RateLimit-Reset", "X-Ttl")
+    if reset is not None:
+        # Some APIs send the reset as a Unix timestamp rather than a number of seconds.
+        if reset > 1e9:
+            reset -= time.time()
+        reset = max(reset, 0.0)
+    return remaining, reset
+
+
+def throttle_class(rate_limit: int, period: int, burst: int = 1):
+    """
+    Class decorator to apply a rate limit to the requests an API class makes.
+
+    The limit is enforced by the request helpers, which wait for the class's throttler before each request
+    they send for one of its methods, retries included. Methods that make no request, such as get_docs_url,
+    are not slowed down at all. A method whose requests weigh more than one call against the limit can be
+    marked with request_cost.
 
     Args:
         rate_limit (int): The maximum number of allowed calls within the period.
         period (int): The time period in seconds during which the rate limit applies.
+        burst (int): How many calls may go through back to back. Default is 1.
 
     Returns:
-        cls: The decorated class with throttling applied to its methods.
+        cls: The decorated class, with its Throttler as the _throttler attribute.
+
+    Raises:
+        TypeError: If the class is not a BaseClient subclass, whose requests are the only ones the helpers throttle.
     """
     def decorator(cls):
         """
-        Decorate the class by wrapping its methods with throttling.
+        Decorate the class by attaching a Throttler to it.
 
         Args:
             cls: The class to decorate.
 
         Returns:
-            cls: The decorated class with throttling applied to its methods.
-        """
-        throttler = Throttler(rate_limit, period)
-        
-        for attr_name in dir(cls):
-            attr = getattr(cls, attr_name)
-            if callable(attr) and not attr_name.startswith("__"):
-                wrapped_attr = wrap_with_throttle(attr, throttler)
-                setattr(cls, attr_name, wrapped_attr)
-        
+            cls: The decorated class.
+        """
+        if not (isinstance(cls, type) and issubclass(cls, BaseClient)):
+            raise TypeError(f"throttle_class can only decorate BaseClient subclasses, not {cls!r}")
+        throttler = Throttler(rate_limit, period, burst)
+        throttler.name = cls.__name__
+        if _shared_path is not None:
+            throttler.state = SQLiteState(cls.__name__, _shared_path)
+        _class_throttlers.append(throttler)
+        cls._throttler = throttler
         return cls
 
-    def wrap_with_throttle(func, throttler):
-        """
-        Wrap a function with throttling.
+    return decorator
 
-        Args:
-            func: The function to wrap.
-            throttler: The Throttler instance to use for throttling.
+def request_cost(cost):
+    """
+    Method decorator setting how many calls' worth of its class's rate limit each request the method sends takes,
+    for endpoints the upstream counts as more than one call. Methods that are not marked cost 1.
 
-        Returns:
-            func: The wrapped function with throttling applied.
-        """
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            throttler.throttle()
-            return func(*args, **kwargs)
-        return wrapper
+    Args:
+        cost (int): The weight of each request.
 
-    return decorator
\ No newline at end of file
+    Returns:
+        func: The decorator, which returns the method unchanged apart from its weight.
+    """
+    if cost < 0:
+        raise ValueError("cost must not be negative")
+    def decorator(func):
+        func.__nokey_cost__ = cost
+        return func
+    return decorator
+
+def cost_of(call):
+    """
+    Returns the weight set with request_cost of the API class method making a call, 1 if none was set.
+    """
+    return getattr(getattr(type(call.client), call.method_name, None), "__nokey_cost__", 1)
+
+def share_between_processes(path=None):
+    """
+    Make the rate limits of the API classes shared by every process on this host, e.g. all the workers of a
+    gunicorn server, instead of each process having its own. Each API class draws from one budget, kept in a
+    SQLite database file. Call this at startup in every process, or set the NOKEY_THROTTLE_DB environment
+    variable to the file's path before importing nokey.
+
+    Args:
+        path (str, optional): The database file. Defaults to nokey_throttle.sqlite3 in the temporary directory.
+
+    Returns:
+        None
+    """
+    global _shared_path
+    _shared_path = path or DEFAULT_PATH
+    for throttler in _class_throttlers:
+        throttler.state = SQLiteState(throttler.name, _shared_path)
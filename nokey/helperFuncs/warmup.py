@@ -0,0 +1,265 @@
+"""
+Prefetch API endpoints into the cache, e.g. reference data at startup, so the first users do not pay for it.
+
+Usage:
+    python -m nokey.helperFuncs.warmup [Class.method ...] [--concurrency N] [--backend NAME] [--expire-after SECONDS] [--every SECONDS]
+
+Without targets, REFERENCE_ENDPOINTS are warmed up.
+"""
+import argparse
+import ast
+import importlib
+import pkgutil
+import sys
+import threading
+import time
+from collections import namedtuple
+import nokey
+from . base_client import BaseClient
+from . batch import map_calls, DEFAULT_CONCURRENCY
+from . make_request import request_options
+from . scheduler import BULK
+from . import hooks
+
+REFERENCE_ENDPOINTS = (
+    "RestCountries.get_all_countries",
+    "NagerDate.get_available_countries",
+    "FilterLists.get_lists",
+    "FilterLists.get_languages",
+    "USAspending.get_def_codes",
+    "USAspending.get_budget_functions",
+    "USAspending.get_award_types",
+    "USAspending.get_toptier_agencies",
+    "ITIS.get_kingdom_names",
+    "ITIS.get_rank_names",
+    "NationalWeatherService.get_alert_types",
+    "ExchangeAPI.get_available_currencies",
+    "Dictum.get_languages",
+)
+
+
+class WarmupTarget(namedtuple("WarmupTarget", ["class_name", "method_name", "args", "kwargs"])):
+    """
+    An API class method call to make during a warm-up.
+
+    Attributes:
+        class_name (str): The name of the API class, e.g. "RestCountries".
+        method_name (str): The name of the method, e.g. "get_all_countries".
+        args (tuple): The positional arguments of the call.
+        kwargs (dict): The keyword arguments of the call.
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        arguments = [repr(arg) for arg in self.args] + [f"{name}={value!r}" for name, value in self.kwargs.items()]
+        call = f"({', '.join(arguments)})" if arguments else ""
+        return f"{self.class_name}.{self.method_name}{call}"
+
+
+WarmupResult = namedtuple("WarmupResult", ["target", "elapsed", "requests", "cache_hits", "error"])
+WarmupResult.__doc__ = """
+The outcome of one call in a warm-up.
+
+Attributes:
+    target (WarmupTarget): The call.
+    elapsed (float): Seconds the call took, including time waiting for the rate limit of its API class.
+    requests (int): Requests the call sent upstream.
+    cache_hits (int): Requests the call answered from the cache.
+    error (Exception): The exception the call failed with, or None if it succeeded.
+"""
+
+
+def parse_target(text):
+    """
+    Parse a warm-up target written as a call, e.g. "RestCountries.get_all_countries" or "NagerDate.get_public_holidays(2024, 'US')".
+
+    Arguments must be Python literals.
+
+    Args:
+        text (str): The target.
+
+    Returns:
+        WarmupTarget: The parsed target.
+
+    Raises:
+        ValueError: If the text is not a call of the form Class.method(literal arguments).
+    """
+    try:
+        node = ast.parse(text.strip(), mode="eval").body
+        args, kwargs = (), {}
+        if isinstance(node, ast.Call):
+            args = tuple(ast.literal_eval(arg) for arg in node.args)
+            kwargs = {keyword.arg: ast.literal_eval(keyword.value) for keyword in node.keywords}
+            node = node.func
+    except (SyntaxError, ValueError) as err:
+        raise ValueError(f"Invalid warm-up target {text!r}: {err}") from None
+    if not (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name)):
+        raise ValueError(f"Invalid warm-up target {text!r}. Expected Class.method or Class.method(arguments).")
+    return WarmupTarget(node.value.id, node.attr, args, kwargs)
+
+
+def find_client_class(name):
+    """
+    Returns the API class with the given name, e.g. "RestCountries", importing the nokey modules as needed.
+
+    Args:
+        name (str): The class name.
+
+    Returns:
+        type: The API class.
+
+    Raises:
+        ValueError: If there is no API class with that name.
+    """
+    for module_info in pkgutil.walk_packages(nokey.__path__, "nokey."):
+        if module_info.name.startswith("nokey.helperFuncs"):
+            continue
+        cls = getattr(importlib.import_module(module_info.name), name, None)
+        if isinstance(cls, type) and issubclass(cls, BaseClient):
+            return cls
+    raise ValueError(f"No API class named {name!r}")
+
+
+def warm_up(targets=REFERENCE_ENDPOINTS, clients=(), concurrency=DEFAULT_CONCURRENCY, priority=BULK, **client_kwargs):
+    """
+    Call a set of API class methods concurrently, so their responses are in the cache before they are needed.
+
+    The calls go through the usual request path, so each waits for the rate limit of its API class, queued
+    with the given priority so that other requests go first. Calls answered from the cache send nothing.
+    A call that fails is reported in its result and does not stop the others.
+
+    Args:
+        targets (iterable): WarmupTarget tuples, or strings parsed with parse_target. Defaults to REFERENCE_ENDPOINTS.
+        clients (iterable): API class instances to make the calls with, so the responses go into their caches.
+            Classes without one get an instance created with use_caching=True and client_kwargs.
+        concurrency (int): How many calls run at the same time. Default is 8.
+        priority (int): The rate limit priority of the calls. Default is scheduler.BULK.
+        **client_kwargs: Arguments for the instances created, e.g. backend="redis" or expire_after=86400.
+
+    Returns:
+        list: A WarmupResult per target, in the order of the targets.
+
+    Raises:
+        ValueError: If a target is invalid or names an unknown API class or method.
+    """
+    targets = [target if isinstance(target, WarmupTarget) else parse_target(target) for target in targets]
+    instances = {type(client).__name__: client for client in clients}
+    for target in targets:
+        if target.class_name not in instances:
+            instances[target.class_name] = find_client_class(target.class_name)(use_caching=True, **client_kwargs)
+        if not callable(getattr(instances[target.class_name], target.method_name, None)):
+            raise ValueError(f"{target.class_name} has no method {target.method_name!r}")
+
+    local = threading.local()
+
+    def count(event):
+        events = getattr(local, "events", None)
+        if events is not None:
+            events.append(event.cache_hit)
+
+    def call(target):
+        local.events = []
+        error = None
+        started = time.perf_counter()
+        try:
+            with request_options(priority=priority, raise_errors=True):
+                getattr(instances[target.class_name], target.method_name)(*target.args, **target.kwargs)
+        except Exception as err:
+            error = err
+        elapsed = time.perf_counter() - started
+        events, local.events = local.events, None
+        return WarmupResult(target, elapsed, events.count(False), events.count(True), error)
+
+    hooks.subscribe(count)
+    try:
+        return [result.result for result in map_calls(call, targets, concurrency)]
+    finally:
+        hooks.unsubscribe(count)
+
+
+def warm_up_every(interval, targets=REFERENCE_ENDPOINTS, callback=None, **kwargs):
+    """
+    Warm up now, and again every interval seconds, in a background thread.
+
+    Responses still fresh in the cache are left as they are, so each round only fetches what has expired.
+
+    Args:
+        interval (float): Seconds between the end of one warm-up and the start of the next.
+        targets (iterable): As for warm_up.
+        callback (callable, optional): Called with the list of WarmupResult of each warm-up.
+        **kwargs: The other arguments of warm_up.
+
+    Returns:
+        threading.Event: Set it to stop the warm-ups.
+    """
+    targets = [target if isinstance(target, WarmupTarget) else parse_target(target) for target in targets]
+    stop = threading.Event()
+
+    def run():
+        while not stop.is_set():
+            results = warm_up(targets, **kwargs)
+            if callback is not None:
+                callback(results)
+            stop.wait(interval)
+
+    threading.Thread(target=run, name="nokey-warm-up", daemon=True).start()
+    return stop
+
+
+def format_report(results):
+    """
+    Returns a warm-up's results as a table, one line per target with its timing, followed by a summary line.
+
+    Args:
+        results (list): WarmupResult tuples.
+
+    Returns:
+        str: The report.
+    """
+    lines = []
+    for result in results:
+        if result.error is not None:
+            status = "error"
+        elif result.requests:
+            status = "fetched"
+        else:
+            status = "cached"
+        line = f"{result.elapsed:9.3f}s  {status:<8} {result.target}"
+        if result.error is not None:
+            line += f": {result.error}"
+        lines.append(line)
+    errors = sum(result.error is not None for result in results)
+    total = sum(result.elapsed for result in results)
+    lines.append(f"{len(results)} endpoints, {sum(result.requests for result in results)} requests, {errors} errors, {total:.3f}s in total")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="nokey-warmup", description="Prefetch API endpoints into the cache.")
+    parser.add_argument("targets", nargs="*", help="Calls to make, e.g. RestCountries.get_all_countries or \"NagerDate.get_public_holidays(2024, 'US')\". Defaults to the reference endpoints.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="How many calls run at the same time. Default is 8.")
+    parser.add_argument("--backend", help="The requests_cache backend of the clients. Defaults to each class's own.")
+    parser.add_argument("--expire-after", type=int, help="Seconds responses stay cached, where no cache_ttl rule says otherwise.")
+    parser.add_argument("--every", type=float, metavar="SECONDS", help="Warm up again every SECONDS seconds until interrupted.")
+    args = parser.parse_args(argv)
+    client_kwargs = {}
+    if args.backend is not None:
+        client_kwargs["backend"] = args.backend
+    if args.expire_after is not None:
+        client_kwargs["expire_after"] = args.expire_after
+    try:
+        targets = [parse_target(target) for target in args.targets] or REFERENCE_ENDPOINTS
+        while True:
+            results = warm_up(targets, concurrency=args.concurrency, **client_kwargs)
+            print(format_report(results), flush=True)
+            if args.every is None:
+                return 1 if any(result.error is not None for result in results) else 0
+            time.sleep(args.every)
+    except ValueError as err:
+        parser.error(str(err))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
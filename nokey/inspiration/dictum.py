@@ -1,7 +1,10 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import DAY, WEEK, NEVER_CACHE
+from .. helperFuncs.async_client import make_async_class
 
-class Dictum:
+class Dictum(BaseClient):
     """
     A class for interacting with the Dictum API.
     
@@ -9,12 +12,14 @@ class Dictum:
         base_url: The base URL of the API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="dictum_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_random_quote": NEVER_CACHE, "get_languages": WEEK, "get_inspiring_*": DAY}
+    def __init__(self, use_caching=False, cache_name="dictum_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://api.fisenko.net/v1/"
         self.about = "Dictum API provides a programmatic way to access the most inspiring expressions of humanity."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -146,10 +151,6 @@ class Dictum:
         """
         endpoint = f"statistics/{language}"
         return mr.make_request(self.base_url+endpoint)
-        
-       
-    
-      
-    
-      
-        
\ No newline at end of file
+
+
+AsyncDictum = make_async_class(Dictum)
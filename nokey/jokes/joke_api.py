@@ -1,9 +1,12 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import NEVER_CACHE
+from .. helperFuncs.async_client import make_async_class
 from .. helperFuncs.throttler import throttle_class
 
-@throttle_class(rate_limit=120, period=60)
-class JokeAPI:
+@throttle_class(rate_limit=120, period=60, burst=10)
+class JokeAPI(BaseClient):
     """
     A class to interact with the JokeAPI API.
     
@@ -11,12 +14,14 @@ class JokeAPI:
         base_url: Base URL for interacting with the API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching="False", cache_name="joke_api_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_joke": NEVER_CACHE}
+    def __init__(self, use_caching=False, cache_name="joke_api_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://v2.jokeapi.dev/joke/"
         self.about = "JokeAPI is a REST API that serves uniformly and well formatted jokes. It can be used without any API token, membership, registration or payment. It supports a variety of filters that can be applied to get just the right jokes you need."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -81,5 +86,5 @@ class JokeAPI:
         
         return mr.make_request(self.base_url+endpoint)
 
-        
-      
\ No newline at end of file
+
+AsyncJokeAPI = make_async_class(JokeAPI)
@@ -1,7 +1,10 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import HOUR, WEEK
+from .. helperFuncs.async_client import make_async_class
 
-class FreeDictionary:
+class FreeDictionary(BaseClient):
     """
     A class to interact with the Free Dictionary API.
     
@@ -9,12 +12,15 @@ class FreeDictionary:
         base_url: The base URL of the Free Dictionary API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="free_dictionary_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"look_up_word": WEEK}
+    negative_ttl = HOUR
+    def __init__(self, use_caching=False, cache_name="free_dictionary_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://api.dictionaryapi.dev/api/v2/entries/en/"
         self.about = "The Free Dictionary API is a powerful tool that allows you to access the vast array of dictionary data."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -39,4 +45,7 @@ class FreeDictionary:
             dict: A dictionary containing the definition of a word and other related information.
         """
         endpoint = f"{word}"
-        return mr.make_request(self.base_url+endpoint)
\ No newline at end of file
+        return mr.make_request(self.base_url+endpoint)
+
+
+AsyncFreeDictionary = make_async_class(FreeDictionary)
@@ -1,7 +1,10 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import NEVER_CACHE
+from .. helperFuncs.async_client import make_async_class
 
-class RandomUserGenerator:
+class RandomUserGenerator(BaseClient):
     """
     A class to interact with the Random User Generator API.
     
@@ -9,12 +12,14 @@ class RandomUserGenerator:
         base_url: The base url of the API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="random_user_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"generate_random_user": NEVER_CACHE}
+    def __init__(self, use_caching=False, cache_name="random_user_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://randomuser.me/api/"
         self.about = "The Random User Generator API is a free, open-source API for generating random user data, like Lorem Ipsum for people."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -39,4 +44,6 @@ class RandomUserGenerator:
             dict: Dictionary containing random information (such as name, DOB, SSN, address, etc) for a random user.
         """
         return mr.make_request(self.base_url)
-        
\ No newline at end of file
+
+
+AsyncRandomUserGenerator = make_async_class(RandomUserGenerator)
@@ -1,8 +1,11 @@
-import requests_cache
 import xmltodict
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import HOUR, DAY, WEEK
+from .. helperFuncs.async_client import make_async_class
 
-class ITIS:
+class ITIS(BaseClient):
     """ 
     A class for interacting with the Integrated Taxonomic Integration System API.
     
@@ -10,12 +13,25 @@ class ITIS:
         base_url: The base URL of the API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="itis_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {
+        "get_last_change_date": HOUR,
+        "get_kingdom_names": WEEK,
+        "get_rank_names": WEEK,
+        "get_vernacular_languages": WEEK,
+        "get_credibility_ratings": WEEK,
+        "get_description": WEEK,
+        "get_geographic_values": WEEK,
+        "get_jurisdiction_values": WEEK,
+        "get_jurisdictional_origin_values": WEEK,
+        "get_*": DAY,
+    }
+    def __init__(self, use_caching=False, cache_name="itis_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "http://www.itis.gov/ITISWebService/services/ITISService/"
         self.about = "The ITIS program is driven by a mission: communicate a comprehensive taxonomy of global species that enables biodiversity information to be discovered, indexed, and connected across all human endeavors."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -1102,72 +1118,6 @@ class ITIS:
             return mr.make_request_for_content(self.base_url+endpoint)
         else:
             return "Error: Format must be either json or xml."
-          
-          
-          
-          
-          
-          
-          
-          
-    
-          
-    
-            
-            
-            
-            
-            
-            
-    
-           
-            
-            
-       
-    
-         
-         
-         
-         
-         
-         
-         
-         
-         
-         
-         
-         
-         
-         
-         
-         
-          
-          
-           
-            
-    
-       
-       
-          
-          
-          
-          
-          
-            
-    
-            
-    
-            
-    
-         
-         
-           
-         
-           
-          
-          
-        
-          
-          
-    
-    
\ No newline at end of file
+
+
+AsyncITIS = make_async_class(ITIS)
@@ -1,7 +1,10 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import DAY
+from .. helperFuncs.async_client import make_async_class
 
-class NobelPrizeAPI:
+class NobelPrizeAPI(BaseClient):
     """
     A class to interact with the Nobel Prize API.
     
@@ -9,12 +12,14 @@ class NobelPrizeAPI:
         base_url: The base url for the Nobel Prize API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="nobel_prize_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_*": DAY}
+    def __init__(self, use_caching=False, cache_name="nobel_prize_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://api.nobelprize.org/2.1/"
         self.about = "The Nobel Prize API returns all information about Laureates and Nobel Prizes."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -80,8 +85,6 @@ class NobelPrizeAPI:
         """
         endpoint = f"laureate/{laureateID}"
         return mr.make_request(self.base_url+endpoint)
-    
-     
-          
-        
- 
\ No newline at end of file
+
+
+AsyncNobelPrizeAPI = make_async_class(NobelPrizeAPI)
@@ -1,7 +1,10 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import MINUTE, DAY
+from .. helperFuncs.async_client import make_async_class
 
-class SpaceflightNews:
+class SpaceflightNews(BaseClient):
     
     """
     A class to interact with the Spaceflight News API.
@@ -10,12 +13,14 @@ class SpaceflightNews:
         base_url: The base URL of the Spaceflight News API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="spaceflight_news_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_articles": 5 * MINUTE, "get_blogs": 5 * MINUTE, "get_reports": 5 * MINUTE, "get_*_by_id": DAY, "get_info": DAY}
+    def __init__(self, use_caching=False, cache_name="spaceflight_news_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://api.spaceflightnewsapi.net/v4/"
         self.about = "The Spaceflight News API (SNAPI) is a product by The Space Devs (TSD). It's the most complete and up-to-date spaceflight news API currently available."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -179,8 +184,6 @@ class SpaceflightNews:
         """
         endpoint = f"reports/{ID}"
         return mr.make_request(self.base_url+endpoint)
-     
-    
-   
-      
-        
+
+
+AsyncSpaceflightNews = make_async_class(SpaceflightNews)
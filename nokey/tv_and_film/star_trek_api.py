@@ -1,7 +1,10 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import HOUR, WEEK
+from .. helperFuncs.async_client import make_async_class
 
-class STAPI:
+class STAPI(BaseClient):
     """
     A class for interacting with the Star Trek API.
     
@@ -9,12 +12,15 @@ class STAPI:
         base_url: The base URL of the API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="stapi_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {"get_data_version": HOUR, "get_*": WEEK}
+    negative_ttl = HOUR
+    def __init__(self, use_caching=False, cache_name="stapi_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://stapi.co/api/"
         self.about = "STAPI (Star Trek API) is an API for accessing information about all things Star Trek."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -1120,54 +1126,6 @@ class STAPI:
         """
         endpoint = f"v2/rest/weapon/search?pageNumber={pageNumber}&pageSize={pageSize}"
         return mr.make_request(self.base_url+endpoint)
-       
-        
-        
-    
-       
-       
-       
-       
-       
-       
-       
-       
-       
-       
-     
-     
-     
-        
-    
-    
- 
- 
- 
-   
-   
-   
-   
-   
-   
-     
-   
-   
- 
- 
- 
-   
-  
-   
- 
-  
-   
-   
-  
-    
-   
-  
-  
-   
-  
-   
-        
\ No newline at end of file
+
+
+AsyncSTAPI = make_async_class(STAPI)
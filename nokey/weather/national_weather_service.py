@@ -1,8 +1,11 @@
-import requests_cache
 from .. helperFuncs import make_request as mr
+from .. helperFuncs.base_client import BaseClient
+from .. helperFuncs.session import cached_session
+from .. helperFuncs.cache_policy import MINUTE, HOUR, DAY, WEEK
+from .. helperFuncs.async_client import make_async_class
 
 
-class NationalWeatherService:
+class NationalWeatherService(BaseClient):
     """
     A class to interact with the National Weather Service API.
     
@@ -10,12 +13,32 @@ class NationalWeatherService:
         base_url: The base URL of the National Weather Service API.
         about: A short description of the API.
     """
-    def __init__(self, use_caching=False, cache_name="nws_cache", backend="sqlite", expire_after=3600):
+    cache_ttl = {
+        "get_alerts": MINUTE,
+        "get_active_alerts*": 30,
+        "get_alert_by_id": HOUR,
+        "get_alert_types": WEEK,
+        "get_glossary": WEEK,
+        "get_sigmets*": 5 * MINUTE,
+        "get_cwsu_advisories*": 5 * MINUTE,
+        "get_observations_by_station": 5 * MINUTE,
+        "get_zone_observations": 5 * MINUTE,
+        "get_*forecast*": 15 * MINUTE,
+        "get_raw_data_by_gridpoints": 15 * MINUTE,
+        "get_stations": DAY,
+        "get_station_metadata": DAY,
+        "get_zones*": DAY,
+        "get_zone_metadata": DAY,
+        "get_text_product_types*": DAY,
+        "get_text_product_locations*": DAY,
+    }
+    def __init__(self, use_caching=False, cache_name="nws_cache", backend="sqlite", expire_after=3600, session=None):
         self.base_url = "https://api.weather.gov/"
         self.about = "The National Weather Service (NWS) API allows developers access to critical forecasts, alerts, and observations, along with other weather data."
+        self.session = session
         
-        if use_caching:
-            requests_cache.install_cache(cache_name, backend=backend, expire_after=expire_after)
+        if use_caching and session is None:
+            self.session = cached_session(cache_name, backend=backend, expire_after=expire_after)
             
     def get_docs_url(self):
         """
@@ -718,50 +741,6 @@ class NationalWeatherService:
         """
         endpoint = f"zones/forecast/{zoneID}/stations"
         return mr.make_request(self.base_url+endpoint)
-    
-    
-    
-    
-  
-       
-       
-        
-        
-     
-      
-      
-      
-        
-    
-    
-      
-      
-      
-   
-   
-   
-   
-        
- 
-      
-      
-      
-        
-        
-        
-    
-       
-     
-     
-     
-        
-    
-       
-        
-        
-   
-        
-        
-    
-    
-    
\ No newline at end of file
+
+
+AsyncNationalWeatherService = make_async_class(NationalWeatherService)